@@ -3,10 +3,13 @@ Aplicação Principal de Interface Gráfica usando Flet
 Simulador de Evolução Corporal com Otimização Genética de Dieta
 """
 
+import os
 import flet as ft
 from typing import List
 
 from src.entities.alimento import AlimentoItem
+from src.utils.catalogo_utils import cardapio_padrao
+from src.utils.fronteira_utils import CAMINHO_PADRAO, registrar_fronteira
 from src.interface.pages import (
     PaginaDadosPessoais,
     PaginaFichaTreino,
@@ -22,6 +25,10 @@ class AppSimulador:
         self.page = page
         self.alimentos = self._criar_cardapio()
         
+        # Tabela de dietas pré-calculadas (lida só na primeira simulação)
+        if os.path.exists(CAMINHO_PADRAO):
+            registrar_fronteira(CAMINHO_PADRAO)
+        
         # Instanciar páginas
         self.pagina_dados = PaginaDadosPessoais(
             callback_validacao=self._on_dados_validados,
@@ -140,32 +147,7 @@ class AppSimulador:
         self.page.update()
     
     def _criar_cardapio(self) -> List[AlimentoItem]:
-        return [
-            AlimentoItem("Frango Grelhado", 165, 100),
-            AlimentoItem("Ovo", 155, 100),
-            AlimentoItem("Peixe", 206, 100),
-            AlimentoItem("Carne Magra", 213, 100),
-            AlimentoItem("Arroz Integral", 130, 100),
-            AlimentoItem("Batata Doce", 86, 100),
-            AlimentoItem("Quinoa", 120, 100),
-            AlimentoItem("Aveia", 389, 100),
-            AlimentoItem("Feijão Preto", 77, 100),
-            AlimentoItem("Lentilha", 116, 100),
-            AlimentoItem("Grão de Bico", 164, 100),
-            AlimentoItem("Brócolis", 55, 100),
-            AlimentoItem("Espinafre", 23, 100),
-            AlimentoItem("Cenoura", 41, 100),
-            AlimentoItem("Banana", 89, 100),
-            AlimentoItem("Maçã", 52, 100),
-            AlimentoItem("Laranja", 47, 100),
-            AlimentoItem("Abacate", 160, 100),
-            AlimentoItem("Azeite", 884, 100),
-            AlimentoItem("Castanha", 553, 100),
-            AlimentoItem("Amendoim", 567, 100),
-            AlimentoItem("Leite Desnatado", 42, 100),
-            AlimentoItem("Iogurte", 59, 100),
-            AlimentoItem("Queijo Branco", 264, 100),
-        ]
+        return cardapio_padrao()
 
 
 def main(page: ft.Page):
@@ -5,24 +5,13 @@ Componente de card para exibir dietas utilizadas na simulação
 import flet as ft
 from typing import List
 from src.entities.alimento import AlimentoItem
+from src.utils.catalogo_utils import CATEGORIAS, ID_OUTRO, classificar_nome
 
 
 def obter_categoria_alimento(nome: str) -> str:
     """Obtém a categoria de um alimento"""
-    categorias = {
-        'proteinas': ['frango', 'ovo', 'peixe', 'carne', 'leite', 'queijo'],
-        'carboidratos': ['arroz', 'batata', 'quinoa', 'aveia', 'pão'],
-        'leguminosas': ['feijão', 'lentilha', 'grão'],
-        'vegetais': ['brócolis', 'espinafre', 'cenoura'],
-        'frutas': ['banana', 'maçã', 'laranja', 'abacate'],
-        'gorduras': ['azeite', 'castanha', 'amendoim']
-    }
-    
-    nome_lower = nome.lower()
-    for categoria, alimentos in categorias.items():
-        if any(alim in nome_lower for alim in alimentos):
-            return categoria
-    return 'outros'
+    id_categoria, _ = classificar_nome(nome)
+    return CATEGORIAS[id_categoria] if id_categoria != ID_OUTRO else 'outros'
 
 
 def agrupar_alimentos_por_categoria(alimentos: List[AlimentoItem]) -> dict:
@@ -8,7 +8,7 @@ import copy
 from src.service.simulation import simular_evolucao
 from src.entities.individuo import Individuo
 from src.interface.util.graficos import criar_graficos_evolucao
-from src.utils.alg_utils import obter_historico_dietas, resetar_cache_elitismo
+from src.utils.alg_utils import ConfiguracaoAG, SessaoOtimizador
 from src.interface.components.dieta_card import criar_dieta_card
 
 
@@ -20,6 +20,7 @@ class PaginaResultados:
         self.ficha_treino = None
         self.semanas = 36
         self.btn_executar = None
+        self.sessao = None  # Estado do otimizador desta página (uma sessão por simulação)
         
     def build(self):
         
@@ -255,7 +256,8 @@ class PaginaResultados:
             self.btn_executar.update()
             
 
-            resetar_cache_elitismo()
+            # Sessão própria: páginas de usuários diferentes não compartilham elitismo nem histórico
+            self.sessao = SessaoOtimizador(ConfiguracaoAG(reaproveitar_populacao=True), motor='fronteira')
             
             self.txt_status.value = "Executando simulacao... Por favor aguarde..."
             self.txt_status.color = ft.Colors.ORANGE_700
@@ -264,7 +266,8 @@ class PaginaResultados:
             self.progress_bar.update()
             
             individuo_sim = copy.deepcopy(self.individuo_original)
-            simular_evolucao(individuo_sim, self.alimentos, self.ficha_treino, self.semanas)
+            # Usa a tabela pré-calculada quando existir; sem ela o motor recorre ao AG
+            simular_evolucao(individuo_sim, self.alimentos, self.ficha_treino, self.semanas, sessao=self.sessao)
             
             self._exibir_resultados(individuo_sim)
             
@@ -456,7 +459,7 @@ class PaginaResultados:
     
     def _exibir_dietas(self):
         self.container_dietas.controls.clear()
-        historico = obter_historico_dietas()
+        historico = self.sessao.obter_historico_dietas() if self.sessao is not None else []
         
         if not historico:
             self.container_dietas.controls.append(
@@ -1,11 +1,104 @@
-from typing import List
-import random
+from typing import Callable, List, Tuple
+import copy
 from src.entities.individuo import Individuo
 from src.entities.alimento import AlimentoItem
 from src.entities.treino import FichaTreino
-from src.utils.alg_utils import mochila_alimentos, resetar_cache_elitismo
+from src.utils.alg_utils import ConfiguracaoAG, SessaoOtimizador, mochila_alimentos, obter_sessao_padrao
+from src.utils.cache_utils import CacheSolucoes
+from src.utils.horizonte_utils import ConfiguracaoHorizonte, PlanejadorHorizonte
+from src.utils.especulacao_utils import ConfiguracaoEspeculacao, ExecutorEspeculativo
 
-def simular_evolucao(individuo: Individuo, alimentos: List[AlimentoItem], ficha_treino: FichaTreino, semanas: int):
+CALORIAS_POR_KG = 7700
+
+def _meta_semana(individuo: Individuo, ficha_treino: FichaTreino) -> Tuple[float, float]:
+    """Meta calórica da semana (sem a variação diária) e gasto calórico diário"""
+    imc_atual = individuo.calcular_imc()
+    gasto_calorico_base = individuo.calcular_gasto_calorico_total()
+    
+    # Gasto calórico adicional do treino (variável por tipo de treino)
+    gasto_treino_semanal = ficha_treino.calcular_gasto_semanal(individuo.peso)
+    gasto_treino_diario = gasto_treino_semanal / 7  # Média diária
+    
+    gasto_calorico = gasto_calorico_base + gasto_treino_diario
+    
+    # Define limites saudáveis de gordura corporal por sexo
+    if individuo.sexo.lower() == 'm':
+        gordura_min, gordura_max = 6, 24  # homens
+    else:
+        gordura_min, gordura_max = 16, 31  # mulheres
+
+    # Cálculo do ajuste calórico
+    ajuste_base = 0
+    
+    # Ajuste baseado no IMC (mais suave)
+    if imc_atual > 25:
+        ajuste_base -= 300 * min(2, (imc_atual - 25) / 5)  # Máximo -600 kcal
+    elif imc_atual < 18.5:
+        ajuste_base += 300 * min(2, (18.5 - imc_atual) / 3)  # Máximo +600 kcal
+        
+    # Ajuste baseado na taxa de gordura (mais suave)
+    if individuo.taxa_gordura > gordura_max:
+        ajuste_base -= 200 * min(2, (individuo.taxa_gordura - gordura_max) / 5)
+    elif individuo.taxa_gordura < gordura_min:
+        ajuste_base += 200 * min(2, (gordura_min - individuo.taxa_gordura) / 3)
+    
+    # Ajuste baseado na tendência (mais conservador)
+    if len(individuo.historico_gordura) > 1:
+        tendencia_gordura = individuo.taxa_gordura - individuo.historico_gordura[-1]
+        if abs(tendencia_gordura) < 0.1:  # Mudança muito lenta
+            ajuste_base *= 1.1  # Aumenta apenas 10%
+    
+    # Garante limites seguros de calorias
+    return max(1500, min(3500, gasto_calorico + ajuste_base)), gasto_calorico
+
+def _atualizar_corpo(individuo: Individuo, calorias_totais: float, gasto_calorico: float,
+                     sortear: Callable[[float, float], float]):
+    """Aplica uma semana com a dieta dada ao peso e à composição corporal"""
+    # Calcula déficit/superávit calórico semanal
+    diferenca_calorica_semanal = (calorias_totais - gasto_calorico) * 7
+    
+    # Mudança de peso semanal mais realista
+    mudanca_peso = diferenca_calorica_semanal / CALORIAS_POR_KG
+    novo_peso = max(45, min(150, individuo.peso + mudanca_peso))  # Limites seguros
+    
+    # Calcula mudança na composição corporal
+    if diferenca_calorica_semanal < 0:
+        # Em déficit: 75-82% da perda é gordura (reduzido de 75-85%)
+        perc_gordura = sortear(0.75, 0.82)
+    else:
+        # Em superávit: 30-35% do ganho é gordura (reduzido de 25-35%)
+        perc_gordura = sortear(0.30, 0.35)
+    
+    mudanca_massa_gordura = mudanca_peso * perc_gordura
+    
+    # Atualiza composição corporal
+    massa_gordura_atual = individuo.peso * (individuo.taxa_gordura / 100)
+    nova_massa_gordura = max(0, massa_gordura_atual + mudanca_massa_gordura)
+    
+    # Atualiza peso e taxa de gordura
+    individuo.peso = novo_peso
+    individuo.taxa_gordura = max(3, min(45, (nova_massa_gordura / novo_peso) * 100))
+    
+    # Registra histórico
+    individuo.historico_imc.append(individuo.calcular_imc())
+    individuo.historico_calorias.append(calorias_totais)
+    individuo.historico_gordura.append(individuo.taxa_gordura)
+
+def _prever_metas(individuo: Individuo, ficha_treino: FichaTreino, meta_atual: float, semanas: int) -> List[float]:
+    """Metas das próximas semanas supondo dietas exatamente na meta (sem sorteios)"""
+    previsto = copy.deepcopy(individuo)
+    metas = []
+    meta = meta_atual
+    for _ in range(semanas):
+        _atualizar_corpo(previsto, meta, _meta_semana(previsto, ficha_treino)[1], lambda a, b: (a + b) / 2)
+        meta = _meta_semana(previsto, ficha_treino)[0]
+        metas.append(meta)
+    return metas
+
+def simular_evolucao(individuo: Individuo, alimentos: List[AlimentoItem], ficha_treino: FichaTreino, semanas: int,
+                     config: ConfiguracaoAG = None, motor: str = None, cache_solucoes: CacheSolucoes = None,
+                     sessao: SessaoOtimizador = None, horizonte: ConfiguracaoHorizonte = None,
+                     especulacao: ConfiguracaoEspeculacao = None):
     """
     Simula a evolução corporal de um indivíduo ao longo de semanas
     
@@ -38,86 +131,69 @@ def simular_evolucao(individuo: Individuo, alimentos: List[AlimentoItem], ficha_
         alimentos: Lista de AlimentoItem disponíveis
         ficha_treino: FichaTreino com divisão de exercícios (ABC/ABCD/PPL)
         semanas: Número de semanas a simular
+        config: Parâmetros do algoritmo genético (ex.: prazo_ms limita a latência por semana).
+            Por padrão a população final de cada semana semeia a semana seguinte.
+        motor: Motor de otimização da dieta semanal ('ag', 'milp', 'enumeracao', 'fronteira' ou 'aco')
+        cache_solucoes: Cache de dietas compartilhado entre simulações (memória e disco)
+        sessao: Estado próprio desta simulação (elitismo, histórico de dietas, RNG e motor),
+            necessário para rodar simulações simultâneas. Sem ela, usa a sessão padrão do módulo.
+            Com sessao.telemetria, ao final sessao.telemetria.resumo() traz a vazão (avaliações/s)
+            e as gerações até convergir desta simulação.
+        horizonte: Planejamento conjunto das semanas em janelas deslizantes (PlanejadorHorizonte),
+            com termos de variedade e rotação entre semanas no lugar do elitismo probabilístico.
+            As metas da janela são previstas com o mesmo modelo corporal; se a meta real se
+            afastar da prevista, a janela é replanejada a partir da semana atual.
+        especulacao: Pré-resolução em processos das metas prováveis das próximas semanas
+            (ExecutorEspeculativo), servida pelo cache de soluções; sem cache_solucoes, usa um
+            cache em memória desta simulação. Não se aplica junto com horizonte.
     """
+    if sessao is None:
+        sessao = obter_sessao_padrao()
+        if config is None:
+            config = ConfiguracaoAG(reaproveitar_populacao=True)
+    
     # Reset do cache de elitismo para iniciar uma nova simulação
-    resetar_cache_elitismo()
+    sessao.resetar()
+    rng = sessao.rng
     
-    CALORIAS_POR_KG = 7700  
+    planejador = None
+    if horizonte is not None:
+        planejador = PlanejadorHorizonte(alimentos, horizonte, config, motor, sessao)
+    executor = None
+    if especulacao is not None and planejador is None:
+        if cache_solucoes is None:
+            cache_solucoes = sessao.cache_solucoes if sessao.cache_solucoes is not None else CacheSolucoes()
+        executor = ExecutorEspeculativo(alimentos, config if config is not None else sessao.config,
+                                        motor if motor is not None else sessao.motor, cache_solucoes, especulacao)
     
-    for semana in range(semanas):
-        imc_atual = individuo.calcular_imc()
-        gasto_calorico_base = individuo.calcular_gasto_calorico_total()
-        
-        # Gasto calórico adicional do treino (variável por tipo de treino)
-        gasto_treino_semanal = ficha_treino.calcular_gasto_semanal(individuo.peso)
-        gasto_treino_diario = gasto_treino_semanal / 7  # Média diária
+    try:
+        for semana in range(semanas):
+            meta_calorica, gasto_calorico = _meta_semana(individuo, ficha_treino)
         
-        gasto_calorico = gasto_calorico_base + gasto_treino_diario
-        
-        # Define limites saudáveis de gordura corporal por sexo
-        if individuo.sexo.lower() == 'm':
-            gordura_min, gordura_max = 6, 24  # homens
-        else:
-            gordura_min, gordura_max = 16, 31  # mulheres
+            # Variação diária muito reduzida (±5 kcal ao invés de ±10)
+            variacao_diaria = rng.uniform(-5, 5)
+            meta_calorica += variacao_diaria
 
-        # Cálculo do ajuste calórico
-        ajuste_base = 0
-        
-        # Ajuste baseado no IMC (mais suave)
-        if imc_atual > 25:
-            ajuste_base -= 300 * min(2, (imc_atual - 25) / 5)  # Máximo -600 kcal
-        elif imc_atual < 18.5:
-            ajuste_base += 300 * min(2, (18.5 - imc_atual) / 3)  # Máximo +600 kcal
-            
-        # Ajuste baseado na taxa de gordura (mais suave)
-        if individuo.taxa_gordura > gordura_max:
-            ajuste_base -= 200 * min(2, (individuo.taxa_gordura - gordura_max) / 5)
-        elif individuo.taxa_gordura < gordura_min:
-            ajuste_base += 200 * min(2, (gordura_min - individuo.taxa_gordura) / 3)
-        
-        # Ajuste baseado na tendência (mais conservador)
-        if len(individuo.historico_gordura) > 1:
-            tendencia_gordura = individuo.taxa_gordura - individuo.historico_gordura[-1]
-            if abs(tendencia_gordura) < 0.1:  # Mudança muito lenta
-                ajuste_base *= 1.1  # Aumenta apenas 10%
-        
-        # Garante limites seguros de calorias
-        meta_calorica = max(1500, min(3500, gasto_calorico + ajuste_base))
-        
-        # Variação diária muito reduzida (±5 kcal ao invés de ±10)
-        variacao_diaria = random.uniform(-5, 5)
-        meta_calorica += variacao_diaria
+            # Especula as próximas semanas enquanto esta é resolvida
+            if executor is not None:
+                profundidade = min(especulacao.profundidade, semanas - semana - 1)
+                executor.especular(_prever_metas(individuo, ficha_treino, meta_calorica, profundidade))
+                executor.confirmar(meta_calorica)
 
-        # Seleciona alimentos e calcula calorias totais
-        selecao_alimentos = mochila_alimentos(alimentos, meta_calorica)
-        calorias_totais = sum(item.calorias for item in selecao_alimentos)
-        
-        # Calcula déficit/superávit calórico semanal
-        diferenca_calorica_semanal = (calorias_totais - gasto_calorico) * 7
-        
-        # Mudança de peso semanal mais realista
-        mudanca_peso = diferenca_calorica_semanal / CALORIAS_POR_KG
-        novo_peso = max(45, min(150, individuo.peso + mudanca_peso))  # Limites seguros
-        
-        # Calcula mudança na composição corporal
-        if diferenca_calorica_semanal < 0:
-            # Em déficit: 75-82% da perda é gordura (reduzido de 75-85%)
-            perc_gordura = random.uniform(0.75, 0.82)
-        else:
-            # Em superávit: 30-35% do ganho é gordura (reduzido de 25-35%)
-            perc_gordura = random.uniform(0.30, 0.35)
-        
-        mudanca_massa_gordura = mudanca_peso * perc_gordura
-        
-        # Atualiza composição corporal
-        massa_gordura_atual = individuo.peso * (individuo.taxa_gordura / 100)
-        nova_massa_gordura = max(0, massa_gordura_atual + mudanca_massa_gordura)
-        
-        # Atualiza peso e taxa de gordura
-        individuo.peso = novo_peso
-        individuo.taxa_gordura = max(3, min(45, (nova_massa_gordura / novo_peso) * 100))
+            # Seleciona alimentos e calcula calorias totais
+            if planejador is None:
+                selecao_alimentos = mochila_alimentos(alimentos, meta_calorica, config=config, motor=motor,
+                                                      cache_solucoes=cache_solucoes, sessao=sessao)
+            else:
+                if planejador.precisa_planejar(semana, meta_calorica):
+                    janela = min(horizonte.janela_semanas, semanas - semana)
+                    metas = [meta_calorica] + _prever_metas(individuo, ficha_treino, meta_calorica, janela - 1)
+                    planejador.planejar(semana, metas)
+                selecao_alimentos = planejador.dieta(semana, meta_calorica)
+            calorias_totais = sum(item.calorias for item in selecao_alimentos)
         
-        # Registra histórico
-        individuo.historico_imc.append(individuo.calcular_imc())
-        individuo.historico_calorias.append(calorias_totais)
-        individuo.historico_gordura.append(individuo.taxa_gordura)
\ No newline at end of file
+            _atualizar_corpo(individuo, calorias_totais, gasto_calorico, rng.uniform)
+    finally:
+        if executor is not None:
+            executor.encerrar()
+            sessao.ultima_especulacao = executor.estatisticas()
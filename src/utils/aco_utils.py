@@ -0,0 +1,130 @@
+from dataclasses import replace
+import numpy as np
+from src.utils.catalogo_utils import CatalogoAlimentos
+from src.utils.cromossomo_utils import CacheFitness
+from src.utils.reparo_utils import obter_indice_calorico
+from src.utils.semeadura_utils import MINIMO_ALIMENTOS, MAXIMO_ALIMENTOS, MAXIMO_POR_CATEGORIA
+from src.utils.alg_utils import (ConfiguracaoAG, ControleParada, SessaoOtimizador, _avaliar_com_cache,
+                                 registrar_motor)
+
+# Limites do feromônio (Max-Min Ant System): nenhum alimento deixa de ser sorteado
+# nem domina a escolha, o que evita a estagnação da colônia
+FEROMONIO_MINIMO = 0.05
+FEROMONIO_MAXIMO = 1.0
+
+class ColoniaDieta:
+    """Colônia de formigas para a seleção de alimentos
+
+    Há um feromônio por alimento do cardápio. A cada iteração, cada formiga monta
+    uma dieta de 5-7 alimentos sorteando um alimento por passo com probabilidade
+    proporcional a feromônio^alfa · desejabilidade^beta; todas as formigas dão o
+    passo juntas (operações NumPy sobre a matriz formigas × alimentos). Depois o
+    feromônio evapora e os alimentos da melhor formiga da iteração e da melhor
+    dieta já vista recebem depósito.
+
+    A colônia fica na sessão: na semana seguinte, o feromônio aprendido e a melhor
+    dieta (reavaliada na nova meta) são o ponto de partida.
+    """
+    def __init__(self, catalogo: CatalogoAlimentos):
+        self.catalogo = catalogo
+        self.feromonio = np.full(len(catalogo), FEROMONIO_MAXIMO)
+        self.melhor = None  # Melhor cromossomo da última execução
+        self.execucoes = 0
+
+    def desejabilidade(self, meta_calorica: float) -> np.ndarray:
+        """Pontuação nutricional pré-calculada vezes o ajuste das calorias a uma porção da meta"""
+        parcela = meta_calorica / ((MINIMO_ALIMENTOS + MAXIMO_ALIMENTOS) / 2)
+        ajuste = np.exp(-np.abs(self.catalogo.calorias - parcela) / parcela)
+        return np.maximum(self.catalogo.pontuacoes(meta_calorica), 1e-6) * ajuste
+
+    def construir(self, num_formigas: int, meta_calorica: float, config: ConfiguracaoAG,
+                  gerador: np.random.Generator) -> np.ndarray:
+        """Dietas das formigas (formigas × alimentos), sem passar de 110% da meta nem de 2 por categoria"""
+        catalogo = self.catalogo
+        num_alimentos = len(catalogo)
+        atratividade = (self.feromonio ** config.alfa_feromonio
+                        * self.desejabilidade(meta_calorica) ** config.beta_heuristica)
+        formigas = np.zeros((num_formigas, num_alimentos), dtype=np.uint8)
+        calorias = np.zeros(num_formigas)
+        contagem = np.zeros((num_formigas, catalogo.matriz_categorias.shape[1]), dtype=np.int64)
+        tamanhos = gerador.integers(MINIMO_ALIMENTOS, MAXIMO_ALIMENTOS + 1, size=num_formigas)
+        superior = meta_calorica * 1.10
+
+        for passo in range(MAXIMO_ALIMENTOS):
+            viaveis = ((formigas == 0) & (calorias[:, None] + catalogo.calorias <= superior)
+                       & (passo < tamanhos)[:, None])
+            viaveis &= ((contagem >= MAXIMO_POR_CATEGORIA) @ catalogo.matriz_categorias.T) == 0
+            acumulado = np.cumsum(atratividade * viaveis, axis=1)
+            total = acumulado[:, -1]
+            ativas = np.flatnonzero(total > 0)
+            if len(ativas) == 0:
+                break
+            # Roleta: primeiro alimento cujo acumulado passa do sorteio
+            sorteio = gerador.random(len(ativas)) * total[ativas]
+            escolhidos = (acumulado[ativas] <= sorteio[:, None]).sum(axis=1)
+            formigas[ativas, escolhidos] = 1
+            calorias[ativas] += catalogo.calorias[escolhidos]
+            contagem[ativas] += catalogo.matriz_categorias[escolhidos]
+        return formigas
+
+    def depositar(self, melhor_iteracao: np.ndarray, melhor_global: np.ndarray, config: ConfiguracaoAG):
+        """Evaporação seguida de depósito da melhor formiga da iteração e da melhor dieta já vista"""
+        taxa = config.evaporacao_feromonio
+        self.feromonio *= 1 - taxa
+        self.feromonio += taxa / 2 * (melhor_iteracao + melhor_global)
+        np.clip(self.feromonio, FEROMONIO_MINIMO, FEROMONIO_MAXIMO, out=self.feromonio)
+
+    def resolver(self, meta_calorica: float, config: ConfiguracaoAG, gerador: np.random.Generator,
+                 controle: ControleParada, telemetria=None) -> np.ndarray:
+        """Executa config.geracoes iterações com config.tamanho_populacao formigas; devolve o melhor cromossomo"""
+        cache = CacheFitness()
+        indice = obter_indice_calorico(self.catalogo) if config.reparo_lamarckiano else None
+        if telemetria is not None:
+            telemetria.iniciar_execucao(cache)
+
+        melhor, melhor_fitness = None, -float('inf')
+        if self.melhor is not None:
+            melhor = self.melhor
+            melhor_fitness = float(_avaliar_com_cache(melhor[None, :], self.catalogo, meta_calorica, cache)[0])
+
+        # Colônia sem dieta anterior: ao menos uma leva de formigas, para haver o que devolver
+        iteracoes = config.geracoes if melhor is not None else max(1, config.geracoes)
+        for iteracao in range(iteracoes):
+            formigas = self.construir(config.tamanho_populacao, meta_calorica, config, gerador)
+            if indice is not None:
+                indice.reparar_populacao(formigas, meta_calorica)
+            aptidao = _avaliar_com_cache(formigas, self.catalogo, meta_calorica, cache)
+
+            vencedora = int(np.argmax(aptidao))
+            if aptidao[vencedora] > melhor_fitness:
+                melhor, melhor_fitness = formigas[vencedora].copy(), float(aptidao[vencedora])
+            self.depositar(formigas[vencedora], melhor, config)
+
+            if telemetria is not None:
+                telemetria.registrar(iteracao + 1, formigas, aptidao)
+            if controle.verificar(formigas, aptidao):
+                break
+
+        if telemetria is not None:
+            telemetria.finalizar_execucao()
+        self.melhor = melhor
+        self.execucoes += 1
+        return melhor
+
+def motor_aco(catalogo: CatalogoAlimentos, meta_calorica: float, config: ConfiguracaoAG,
+              sessao: SessaoOtimizador) -> np.ndarray:
+    """Motor de colônia de formigas; a colônia da sessão é reaproveitada enquanto o cardápio for o mesmo"""
+    colonia = sessao.estado_motores.get('aco')
+    if colonia is None or colonia.catalogo is not catalogo or not config.reaproveitar_feromonio:
+        colonia = ColoniaDieta(catalogo)
+        sessao.estado_motores['aco'] = colonia
+    elif config.geracoes_reaproveitamento is not None:
+        config = replace(config, geracoes=config.geracoes_reaproveitamento)
+
+    controle = ControleParada(config)
+    gerador = np.random.default_rng(sessao.rng.getrandbits(64))
+    melhor = colonia.resolver(meta_calorica, config, gerador, controle, sessao.telemetria)
+    sessao.contadores_parada[controle.motivo] += 1
+    return melhor
+
+registrar_motor('aco', motor_aco)
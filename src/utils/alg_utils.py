@@ -1,21 +1,137 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from dataclasses import dataclass, replace
+import importlib
 import random
-from pulp import *
+from time import perf_counter
+import numpy as np
 from src.entities.alimento import AlimentoItem
+from src.utils.catalogo_utils import (CatalogoAlimentos, CATEGORIAS, ID_OUTRO, FATORES_FAIXA,
+                                      classificar_nome, compilar_catalogo, faixa_porcao)
+from src.utils.cromossomo_utils import Cromossomo, CacheFitness, chave_genotipo
+from src.utils.cache_utils import CacheSolucoes
+from src.utils.reparo_utils import obter_indice_calorico
+from src.utils.historico_utils import HistoricoDietas
+from src.utils.operadores_utils import obter_operador
 
-# Cache global para armazenar a melhor solução anterior (elitismo)
-_melhor_solucao_cache = {
-    'alimentos': None,
-    'score': -float('inf'),
-    'calorias': 0,
-    'peso_execucoes': 0  # Quantas execuções sem mudança
-}
+def calcular_pontuacao_nutricional(alimento: AlimentoItem, meta_calorica: float) -> float:
+    """Calcula a pontuação nutricional de um alimento baseado em seus atributos"""
+    # Multiplicador das categorias (classificação do nome feita uma única vez)
+    _, pontuacao = classificar_nome(alimento.nome)
+    
+    # Ajuste pela proporção calórica ideal
+    return pontuacao * float(FATORES_FAIXA[faixa_porcao(alimento.calorias, meta_calorica)])
+
+def obter_categoria_alimento(nome: str) -> str:
+    """Obtém a categoria de um alimento"""
+    id_categoria, _ = classificar_nome(nome)
+    return CATEGORIAS[id_categoria] if id_categoria != ID_OUTRO else 'outro'
+
+def _bonus_balanceamento(contagem: np.ndarray) -> np.ndarray:
+    """Bônus de balanceamento a partir das contagens (indivíduos × categorias)"""
+    # Verificar presença mínima de categorias importantes
+    bonus = (15 * (contagem[:, CATEGORIAS.index('proteinas')] >= 1)
+             + 15 * (contagem[:, CATEGORIAS.index('carboidratos')] >= 1)
+             + 10 * (contagem[:, CATEGORIAS.index('vegetais')] >= 1)
+             + 5 * (contagem[:, CATEGORIAS.index('frutas')] >= 1))
+    
+    # Penalidade por excesso de uma única categoria
+    max_categoria = contagem.max(axis=1)
+    return bonus - np.where(max_categoria > 2, (max_categoria - 2) * 5, 0)
+
+def verificar_balanceamento_categorias(alimentos: List[AlimentoItem]) -> float:
+    """Verifica se há balanceamento entre categorias de alimentos"""
+    ids = [classificar_nome(alimento.nome)[0] for alimento in alimentos]
+    contagem = np.bincount(ids, minlength=ID_OUTRO + 1)[:ID_OUTRO].reshape(1, -1)
+    return int(_bonus_balanceamento(contagem)[0])
+
+def _agregados_populacao(populacao: np.ndarray, catalogo: CatalogoAlimentos,
+                         meta_calorica: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Termos aditivos do fitness para cada indivíduo (indivíduos × alimentos)
+    
+    Returns:
+        (calorias_total, pontuacao_nutricional, num_alimentos, contagem_categorias)
+    """
+    selecao = populacao.astype(np.float64)
+    num_alimentos = populacao.sum(axis=1, dtype=np.int64)
+    calorias_total = selecao @ catalogo.calorias
+    pontuacao_nutricional = selecao @ catalogo.pontuacoes(meta_calorica)
+    contagem = populacao.astype(np.int64) @ catalogo.matriz_categorias
+    return calorias_total, pontuacao_nutricional, num_alimentos, contagem
 
-# Cache para armazenar histórico de dietas (máximo 10)
-_historico_dietas = []
+def _penalidade_calorica(calorias_total: np.ndarray, meta_calorica: float) -> np.ndarray:
+    """Penalidade por desvio calórico além da tolerância de 10% da meta"""
+    desvio_calorico = np.abs(calorias_total - meta_calorica)
+    return np.maximum(0, desvio_calorico - (meta_calorica * 0.1))
+
+def _bonus_variedade(num_alimentos: np.ndarray) -> np.ndarray:
+    """Bônus por variedade (5-7 alimentos idealmente)"""
+    return np.where((num_alimentos >= 5) & (num_alimentos <= 7), 10,
+                    np.maximum(0, 5 - np.abs(num_alimentos - 6)))
+
+def _fitness_agregados(calorias_total: np.ndarray, pontuacao_nutricional: np.ndarray, num_alimentos: np.ndarray,
+                       contagem: np.ndarray, meta_calorica: float) -> np.ndarray:
+    """Combina os termos aditivos no fitness final de cada indivíduo"""
+    penalidade_calorica = _penalidade_calorica(calorias_total, meta_calorica)
+    bonus_variedade = _bonus_variedade(num_alimentos)
+    
+    # Balanceamento por categoria (contagens indivíduos × categorias)
+    bonus_balanceamento = _bonus_balanceamento(contagem)
+    
+    fitness = pontuacao_nutricional + bonus_variedade + bonus_balanceamento - (penalidade_calorica / 100)
+    fitness[num_alimentos == 0] = -1000
+    return fitness
+
+def _fitness_vetorizado(populacao: np.ndarray, catalogo: CatalogoAlimentos, meta_calorica: float) -> np.ndarray:
+    """Calcula o fitness de toda a população (indivíduos × alimentos) em uma passada
+    
+    Reproduz exatamente os termos do fitness original por indivíduo e de
+    verificar_balanceamento_categorias, trocando os laços por produtos matriz-vetor.
+    """
+    return _fitness_agregados(*_agregados_populacao(populacao, catalogo, meta_calorica), meta_calorica)
+
+def _avaliar_com_cache(populacao: np.ndarray, catalogo: CatalogoAlimentos, meta_calorica: float,
+                      cache: CacheFitness) -> np.ndarray:
+    """Fitness vetorizado que consulta o cache LRU antes de avaliar
+    
+    Só os genótipos inéditos (fora do cache e sem repetição dentro do lote)
+    passam pelo núcleo vetorizado.
+    """
+    aptidao = np.empty(len(populacao), dtype=np.float64)
+    pendentes = {}  # chave do genótipo -> linhas que precisam desse fitness
+    for linha, chave in enumerate(chave_genotipo(populacao)):
+        fitness = cache.obter((chave, meta_calorica))
+        if fitness is None:
+            pendentes.setdefault(chave, []).append(linha)
+        else:
+            aptidao[linha] = fitness
+    
+    if pendentes:
+        primeiras = [linhas[0] for linhas in pendentes.values()]
+        novos = _fitness_vetorizado(populacao[primeiras], catalogo, meta_calorica)
+        for (chave, linhas), fitness in zip(pendentes.items(), novos):
+            aptidao[linhas] = fitness
+            cache.guardar((chave, meta_calorica), float(fitness))
+    return aptidao
+
+def avaliar_populacao(populacao: np.ndarray, alimentos: List[AlimentoItem], meta_calorica: float) -> np.ndarray:
+    """Calcula o fitness de uma população inteira representada como matriz 0/1
+    
+    Args:
+        populacao: Matriz (indivíduos × alimentos) de 0s e 1s
+        alimentos: Lista de AlimentoItem correspondente às colunas
+        meta_calorica: Meta calórica diária
+        
+    Returns:
+        Vetor com o fitness de cada indivíduo
+    """
+    return _fitness_vetorizado(populacao, compilar_catalogo(alimentos), meta_calorica)
 
 class IndividuoGenetico:
-    """Representa um indivíduo da população no algoritmo genético"""
+    """Representa um indivíduo da população no algoritmo genético
+    
+    Os motores evoluem a população como matriz 0/1; o indivíduo avulso usa o
+    mesmo núcleo vetorizado (matriz de uma linha) para calcular o fitness.
+    """
     def __init__(self, cromossomo: List[int], alimentos: List[AlimentoItem], meta_calorica: float):
         self.cromossomo = cromossomo  # Lista de 0s e 1s indicando presença/ausência
         self.alimentos = alimentos
@@ -25,32 +141,8 @@ class IndividuoGenetico:
     
     def calcular_fitness(self):
         """Calcula o fitness (qualidade) deste indivíduo"""
-        alimentos_selecionados = [self.alimentos[i] for i in range(len(self.alimentos)) 
-                                 if self.cromossomo[i] == 1]
-        
-        if len(alimentos_selecionados) == 0:
-            self.fitness = -1000
-            return
-        
-        calorias_total = sum(a.calorias for a in alimentos_selecionados)
-        
-        # Penalidade por desvio calórico
-        desvio_calorico = abs(calorias_total - self.meta_calorica)
-        penalidade_calorica = max(0, desvio_calorico - (self.meta_calorica * 0.1))
-        
-        # Pontuação nutricional
-        pontuacao_nutricional = sum(calcular_pontuacao_nutricional(a, self.meta_calorica) 
-                                   for a in alimentos_selecionados)
-        
-        # Bônus por variedade (5-7 alimentos idealmente)
-        num_alimentos = len(alimentos_selecionados)
-        bonus_variedade = 10 if 5 <= num_alimentos <= 7 else max(0, 5 - abs(num_alimentos - 6))
-        
-        # Verificar balanceamento por categoria
-        bonus_balanceamento = verificar_balanceamento_categorias(alimentos_selecionados)
-        
-        # Fitness final
-        self.fitness = pontuacao_nutricional + bonus_variedade + bonus_balanceamento - (penalidade_calorica / 100)
+        matriz = np.array(self.cromossomo, dtype=np.uint8).reshape(1, -1)
+        self.fitness = float(_fitness_vetorizado(matriz, compilar_catalogo(self.alimentos), self.meta_calorica)[0])
     
     def mutar(self, taxa_mutacao: float = 0.1):
         """Aplica mutação aleatória no cromossomo"""
@@ -71,253 +163,582 @@ class IndividuoGenetico:
         
         return filho1, filho2
 
-def calcular_pontuacao_nutricional(alimento: AlimentoItem, meta_calorica: float) -> float:
-    """Calcula a pontuação nutricional de um alimento baseado em seus atributos"""
-    # Categorias de alimentos
-    categorias = {
-        'proteinas': ['frango', 'ovo', 'peixe', 'carne', 'leite', 'queijo'],
-        'carboidratos': ['arroz', 'batata', 'quinoa', 'aveia', 'pão'],
-        'leguminosas': ['feijão', 'lentilha', 'grão'],
-        'vegetais': ['brócolis', 'espinafre', 'cenoura'],
-        'frutas': ['banana', 'maçã', 'laranja', 'abacate'],
-        'gorduras': ['azeite', 'castanha', 'amendoim']
-    }
+@dataclass
+class ConfiguracaoAG:
+    """Parâmetros do algoritmo genético de seleção de alimentos"""
+    tamanho_populacao: int = 50
+    geracoes: int = 30
+    taxa_mutacao: float = 0.08
+    taxa_elitismo: float = 0.15
+    tamanho_torneio: int = 3
     
-    # Pontuação base
-    pontuacao = 1.0
-    nome_lower = alimento.nome.lower()
-    
-    # Pontuação por categoria
-    for categoria, alimentos in categorias.items():
-        if any(alim in nome_lower for alim in alimentos):
-            if categoria == 'proteinas':
-                pontuacao *= 1.4  # Proteínas são essenciais
-            elif categoria == 'carboidratos':
-                pontuacao *= 1.3  # Carboidratos para energia
-            elif categoria == 'leguminosas':
-                pontuacao *= 1.35  # Boa fonte de proteína e fibras
-            elif categoria == 'vegetais':
-                pontuacao *= 1.25  # Vitaminas e minerais
-            elif categoria == 'frutas':
-                pontuacao *= 1.2   # Vitaminas e fibras
-            elif categoria == 'gorduras':
-                pontuacao *= 1.15  # Gorduras boas, mas em menor quantidade
-            
-    # Ajuste pela proporção calórica ideal
-    calorias_ideais_refeicao = meta_calorica / 3  # Divide em 3 refeições
-    if abs(alimento.calorias - calorias_ideais_refeicao) <= 100:
-        pontuacao *= 1.2  # Bônus para porções adequadas
-    elif alimento.calorias > calorias_ideais_refeicao * 1.5:
-        pontuacao *= 0.8  # Penalidade para alimentos muito calóricos
-        
-    return pontuacao
+    # Modelo de ilhas: num_ilhas > 1 evolui subpopulações em processos separados,
+    # trocando os melhores indivíduos a cada intervalo_migracao gerações
+    num_ilhas: int = 1
+    intervalo_migracao: int = 5
+    num_migrantes: int = 2
+    trabalhadores: Optional[int] = None  # None = um processo por ilha, limitado aos núcleos
+    
+    # Critérios de parada antecipada (None desativa o critério)
+    janela_estagnacao: Optional[int] = None  # Gerações sem melhora maior que delta_minimo
+    delta_minimo: float = 0.0
+    diversidade_minima: Optional[float] = None  # Entre 0 (população clonada) e 1
+    prazo_ms: Optional[float] = None  # Tempo máximo; devolve a melhor solução até então
+    
+    # Aquecimento: semeia a população com a população final da execução anterior
+    reaproveitar_populacao: bool = False
+    top_k_reaproveitamento: Optional[int] = None  # None = população inteira
+    geracoes_reaproveitamento: Optional[int] = None  # Gerações quando há semente (None = geracoes)
+    
+    # Semeadura heurística: fração da população inicial construída (gulosa pela razão
+    # pontuação/caloria, uma por categoria e variantes aleatórias dentro da meta)
+    fracao_semeadura: float = 0.0
+    
+    # Reparo lamarckiano: indivíduos fora da janela de ±10% da meta são corrigidos
+    # (e o genótipo corrigido é o que segue na população) antes da avaliação
+    reparo_lamarckiano: bool = False
+    
+    # Poda por dominância: antes do motor, remove os alimentos dominados por outros da
+    # mesma categoria (mais pontuação com as mesmas ou menos calorias) para a meta
+    podar_catalogo: bool = False
+    
+    # Operadores genéticos por nome (registro em operadores_utils)
+    operador_selecao: str = 'torneio'
+    operador_cruzamento: str = 'um_ponto'  # 'um_ponto', 'k_pontos' ou 'uniforme'
+    operador_mutacao: str = 'dois_niveis'  # 'dois_niveis' (regra original) ou 'bit_flip'
+    pontos_cruzamento: int = 2  # Cortes do cruzamento 'k_pontos'
+    
+    # 'geracional' (população renovada a cada geração, exceto a elite) ou 'estacionario'
+    # (a cada passo só os piores são substituídos e clones são descartados sem avaliação)
+    modo_evolucao: str = 'geracional'
+    substituicoes_por_passo: Optional[int] = None  # Modo estacionário (None = metade da população)
+    
+    # 'binaria' (um gene por alimento do cardápio) ou 'esparsa' (índices ordenados dos
+    # 5-7 alimentos da dieta; custo proporcional à dieta, não ao cardápio; só no modo geracional,
+    # sem ilhas, aquecimento nem os operadores de cruzamento e mutação binários)
+    codificacao: str = 'binaria'
+    
+    # Motor 'aco' (colônia de formigas): tamanho_populacao formigas por iteração e
+    # geracoes iterações; o feromônio de cada alimento passa de uma semana para a outra
+    alfa_feromonio: float = 1.0  # Peso do feromônio na escolha do alimento
+    beta_heuristica: float = 2.0  # Peso da desejabilidade (pontuação e ajuste calórico)
+    evaporacao_feromonio: float = 0.1
+    reaproveitar_feromonio: bool = True
 
-def obter_categoria_alimento(nome: str) -> str:
-    """Obtém a categoria de um alimento"""
-    categorias = {
-        'proteinas': ['frango', 'ovo', 'peixe', 'carne', 'leite', 'queijo'],
-        'carboidratos': ['arroz', 'batata', 'quinoa', 'aveia', 'pão'],
-        'leguminosas': ['feijão', 'lentilha', 'grão'],
-        'vegetais': ['brócolis', 'espinafre', 'cenoura'],
-        'frutas': ['banana', 'maçã', 'laranja', 'abacate'],
-        'gorduras': ['azeite', 'castanha', 'amendoim']
-    }
+def diversidade_populacao(populacao: np.ndarray) -> float:
+    """Diversidade genética média da população, entre 0 (todos iguais) e 1
     
-    nome_lower = nome.lower()
-    for categoria, alimentos in categorias.items():
-        if any(alim in nome_lower for alim in alimentos):
-            return categoria
-    return 'outro'
+    Usa a heterozigosidade por gene, 4·p·(1-p), onde p é a frequência do gene.
+    """
+    frequencia = populacao.mean(axis=0)
+    return float(np.mean(4 * frequencia * (1 - frequencia))) if populacao.size else 0.0
 
-def verificar_balanceamento_categorias(alimentos: List[AlimentoItem]) -> float:
-    """Verifica se há balanceamento entre categorias de alimentos"""
-    categorias = {
-        'proteinas': 0,
-        'carboidratos': 0,
-        'leguminosas': 0,
-        'vegetais': 0,
-        'frutas': 0,
-        'gorduras': 0,
-    }
+class ControleParada:
+    """Acompanha os critérios de parada de uma execução do algoritmo genético"""
+    def __init__(self, config: ConfiguracaoAG, inicio: float = None):
+        self.config = config
+        self.inicio = inicio if inicio is not None else perf_counter()
+        self.melhor_fitness = -float('inf')
+        self.geracoes_sem_melhora = 0
+        self.geracoes = 0
+        self.motivo = 'geracoes'
     
-    for alimento in alimentos:
-        categoria = obter_categoria_alimento(alimento.nome)
-        if categoria in categorias:
-            categorias[categoria] += 1
+    def tempo_decorrido_ms(self) -> float:
+        return (perf_counter() - self.inicio) * 1000
     
-    # Verificar presença mínima de categorias importantes
-    bonus = 0
-    if categorias['proteinas'] >= 1:
-        bonus += 15
-    if categorias['carboidratos'] >= 1:
-        bonus += 15
-    if categorias['vegetais'] >= 1:
-        bonus += 10
-    if categorias['frutas'] >= 1:
-        bonus += 5
+    def prazo_esgotado(self) -> bool:
+        return self.config.prazo_ms is not None and self.tempo_decorrido_ms() >= self.config.prazo_ms
     
-    # Penalidade por excesso de uma única categoria
-    max_categoria = max(categorias.values())
-    if max_categoria > 2:
-        bonus -= (max_categoria - 2) * 5
+    def verificar(self, populacao: np.ndarray, aptidao: np.ndarray, geracoes: int = 1,
+                  diversidade: Optional[float] = None) -> bool:
+        """Registra as gerações concluídas e indica se a evolução deve parar
+        
+        A diversidade pode vir pronta (codificações em que a população não é a matriz 0/1).
+        """
+        config = self.config
+        self.geracoes += geracoes
+        
+        melhor = float(aptidao.max())
+        if melhor > self.melhor_fitness + config.delta_minimo:
+            self.geracoes_sem_melhora = 0
+        else:
+            self.geracoes_sem_melhora += geracoes
+        self.melhor_fitness = max(self.melhor_fitness, melhor)
+        
+        if self.prazo_esgotado():
+            self.motivo = 'prazo'
+        elif config.janela_estagnacao is not None and self.geracoes_sem_melhora >= config.janela_estagnacao:
+            self.motivo = 'estagnacao'
+        elif (config.diversidade_minima is not None
+              and (diversidade if diversidade is not None else diversidade_populacao(populacao))
+              < config.diversidade_minima):
+            self.motivo = 'diversidade'
+        else:
+            return False
+        return True
+
+class SessaoOtimizador:
+    """Estado de uma simulação: elitismo entre semanas, histórico de dietas, RNG e motor
+    
+    Cada simulação usa sua própria sessão, de modo que várias podem rodar ao mesmo
+    tempo (threads, processos ou sessões web) sem misturar resultados. As funções
+    de módulo (resetar_cache_elitismo, obter_historico_dietas, ...) operam sobre
+    uma sessão padrão, mantida por compatibilidade.
+    """
+    def __init__(self, config: ConfiguracaoAG = None, motor: str = 'ag',
+                 cache_solucoes: CacheSolucoes = None, semente: Optional[int] = None,
+                 capacidade_historico: int = 10, telemetria=None):
+        self.config = config if config is not None else ConfiguracaoAG()
+        self.motor = motor
+        self.cache_solucoes = cache_solucoes
+        self.rng = random.Random(semente)
+        self.capacidade_historico = capacidade_historico
+        self.telemetria = telemetria  # TelemetriaAG opcional (telemetria_utils)
+        self.resetar()
+    
+    def resetar(self):
+        """Descarta o elitismo, o histórico, a semente de população, o estado dos motores e os contadores"""
+        # Melhor solução anterior (elitismo)
+        self.melhor_solucao = {
+            'alimentos': None,
+            'score': -float('inf'),
+            'calorias': 0,
+            'peso_execucoes': 0  # Quantas execuções sem mudança
+        }
+        # Histórico de dietas distintas (as capacidade_historico mais recentes)
+        self.historico = HistoricoDietas(self.capacidade_historico)
+        # População final da última execução, usada como semente da próxima (aquecimento)
+        self.populacao_reaproveitada = {
+            'catalogo': None,
+            'populacao': None
+        }
+        # Quantas execuções do AG terminaram por cada critério de parada
+        self.contadores_parada = {'geracoes': 0, 'estagnacao': 0, 'diversidade': 0, 'prazo': 0}
+        # Estado que outros motores mantêm entre semanas (ex.: feromônio do 'aco')
+        self.estado_motores = {}
+        # Resumo da poda do cardápio na última otimização (config.podar_catalogo)
+        self.ultima_poda = None
+        # Acertos da pré-resolução especulativa na última simulação (simular_evolucao(especulacao=...))
+        self.ultima_especulacao = None
+        if self.telemetria is not None:
+            self.telemetria.limpar()
+    
+    def obter_contadores_parada(self) -> dict:
+        return self.contadores_parada.copy()
+    
+    def obter_historico_dietas(self) -> List[dict]:
+        return self.historico.dietas()
     
-    return bonus
+    def adicionar_dieta_historico(self, alimentos: List[AlimentoItem], calorias: float,
+                                  catalogo: CatalogoAlimentos = None):
+        """Registra a dieta pelos índices no cardápio; sem cardápio, a própria dieta serve de cardápio"""
+        indices = None
+        if catalogo is not None:
+            indices = [catalogo.posicoes.get(id(a)) for a in alimentos]
+        if indices is None or None in indices:
+            ordenados = sorted(alimentos, key=lambda a: a.nome)
+            catalogo = CatalogoAlimentos(ordenados)
+            indices = [catalogo.posicoes[id(a)] for a in alimentos]
+        self.historico.adicionar(catalogo, indices, calorias)
 
-def mochila_alimentos(alimentos: List[AlimentoItem], capacidade_calorica: float, usar_elitismo: bool = True) -> List[AlimentoItem]:
-    """Otimiza a seleção de alimentos usando algoritmo genético com elitismo"""
-    global _melhor_solucao_cache
+# Sessão usada quando nenhuma é informada (API de módulo anterior)
+_sessao_padrao = SessaoOtimizador()
+
+def obter_sessao_padrao() -> SessaoOtimizador:
+    return _sessao_padrao
+
+def _populacao_inicial(tamanho_populacao: int, num_genes: int, semente: np.ndarray = None,
+                       rng=random) -> np.ndarray:
+    """População inicial (matriz indivíduos × alimentos)
     
+    As primeiras linhas vêm da semente, se houver; o restante é aleatório.
+    """
+    num_semente = 0 if semente is None else min(len(semente), tamanho_populacao)
+    # Os genes são sorteados em bloco por um gerador numpy semeado pelo rng da sessão,
+    # mantendo a reprodutibilidade sem um sorteio por gene
+    gerador = np.random.default_rng(rng.getrandbits(64))
+    aleatorios = gerador.integers(0, 2, size=(tamanho_populacao - num_semente, num_genes), dtype=np.uint8)
+    if num_semente == 0:
+        return aleatorios
+    return np.concatenate((semente[:num_semente].astype(np.uint8), aleatorios))
 
-    variacao = random.uniform(-2, 2)
-    capacidade_calorica = max(1500, min(3500, capacidade_calorica + variacao))
+def _obter_semente_populacao(sessao: SessaoOtimizador, catalogo: CatalogoAlimentos,
+                             config: ConfiguracaoAG) -> Optional[np.ndarray]:
+    """População guardada pela execução anterior, se o aquecimento estiver ativo e o cardápio for o mesmo"""
+    reaproveitada = sessao.populacao_reaproveitada
+    if not config.reaproveitar_populacao or reaproveitada['catalogo'] is not catalogo:
+        return None
+    return reaproveitada['populacao']
+
+def _guardar_semente_populacao(sessao: SessaoOtimizador, catalogo: CatalogoAlimentos, populacao: np.ndarray,
+                               aptidao: np.ndarray, config: ConfiguracaoAG):
+    """Guarda os top-K indivíduos finais (em ordem de fitness) para a próxima execução"""
+    ordem = np.argsort(-aptidao, kind='stable')[:config.top_k_reaproveitamento]
+    sessao.populacao_reaproveitada = {
+        'catalogo': catalogo,
+        'populacao': populacao[ordem].copy()
+    }
+
+def _agregados_descendentes(agregados_origens: tuple, linhas: np.ndarray, genes: np.ndarray, sinal: np.ndarray,
+                            catalogo: CatalogoAlimentos, meta_calorica: float) -> tuple:
+    """Agregados dos descendentes a partir dos agregados do pai de origem de cada um
+    
+    Os termos do fitness são aditivos por alimento: cada gene (linhas[j], genes[j])
+    entra (sinal +1) ou sai (-1) da dieta do pai, e só esses genes são somados,
+    sem os produtos pelo cardápio inteiro.
+    """
+    calorias, pontuacao, num_alimentos, contagem = (termo.copy() for termo in agregados_origens)
+    quantidade = len(calorias)
+    calorias += np.bincount(linhas, sinal * catalogo.calorias[genes], quantidade)
+    pontuacao += np.bincount(linhas, sinal * catalogo.pontuacoes(meta_calorica)[genes], quantidade)
+    num_alimentos += np.bincount(linhas, sinal, quantidade).astype(np.int64)
+    categorias = catalogo.categorias[genes]
+    com_categoria = categorias != ID_OUTRO
+    np.add.at(contagem, (linhas[com_categoria], categorias[com_categoria]), sinal[com_categoria])
+    return calorias, pontuacao, num_alimentos, contagem
+
+def _evoluir_populacao(populacao: np.ndarray, aptidao: np.ndarray, catalogo: CatalogoAlimentos,
+                       meta_calorica: float, config: ConfiguracaoAG, geracoes: int,
+                       controle: ControleParada = None,
+                       rng=random, telemetria=None) -> Tuple[np.ndarray, np.ndarray, int, int]:
+    """Evolui a população por um número de gerações
     
-    # ====== ALGORITMO GENÉTICO ======
-    tamanho_populacao = 50
-    geracoes = 30
-    taxa_mutacao = 0.08 
-    taxa_elitismo_ga = 0.15  
+    Seleção, cruzamento e mutação são os operadores nomeados no config, cada um
+    aplicado à população inteira de uma vez. Os descendentes são avaliados por
+    diferença em relação ao pai de origem (_agregados_descendentes). Com um ControleParada, a evolução
+    termina antes se algum critério de parada disparar. Com uma TelemetriaAG
+    (telemetria_utils), cada geração é registrada nela.
     
-    # Inicializa população aleatória
-    populacao = []
-    for _ in range(tamanho_populacao):
-        cromossomo = [random.randint(0, 1) for _ in range(len(alimentos))]
-        individuo = IndividuoGenetico(cromossomo, alimentos, capacidade_calorica)
-        populacao.append(individuo)
+    Returns:
+        (populacao, aptidao, avaliacoes, acertos_cache): descendentes avaliados e
+        consultas atendidas pelo cache (só no modo estacionário) nas gerações executadas
+    """
+    if config.modo_evolucao == 'estacionario':
+        return _evoluir_estacionario(populacao, aptidao, catalogo, meta_calorica, config, geracoes,
+                                     controle, rng, telemetria)
+    if config.modo_evolucao != 'geracional':
+        raise ValueError(f"Modo de evolução desconhecido: {config.modo_evolucao}")
+    
+    tamanho_populacao, num_genes = populacao.shape
+    selecao = obter_operador('selecao', config.operador_selecao)
+    cruzamento = obter_operador('cruzamento', config.operador_cruzamento)
+    mutacao = obter_operador('mutacao', config.operador_mutacao)
+    gerador = np.random.default_rng(rng.getrandbits(64))
+    agregados = _agregados_populacao(populacao, catalogo, meta_calorica)
+    avaliacoes = 0
     
-    # Evolui a população
     for geracao in range(geracoes):
         # Ordena por fitness
-        populacao.sort(key=lambda x: x.fitness, reverse=True)
+        ordem = np.argsort(-aptidao, kind='stable')
+        populacao, aptidao = populacao[ordem], aptidao[ordem]
+        agregados = tuple(termo[ordem] for termo in agregados)
         
-        # Elitismo: mantém os melhores
-        num_elite = max(1, int(tamanho_populacao * taxa_elitismo_ga))
-        nova_populacao = [IndividuoGenetico(ind.cromossomo.copy(), alimentos, capacidade_calorica) 
-                         for ind in populacao[:num_elite]]
+        # Elitismo: mantém os melhores (fitness já conhecido, não é reavaliado)
+        num_elite = max(1, int(tamanho_populacao * config.taxa_elitismo))
+        nova_populacao = np.empty_like(populacao)
+        nova_populacao[:num_elite] = populacao[:num_elite]
         
-        # Gera nova população por cruzamento e mutação
-        while len(nova_populacao) < tamanho_populacao:
-            # Seleção por torneio
-            pai1 = _torneio_selecao(populacao, tamanho_torneio=3)
-            pai2 = _torneio_selecao(populacao, tamanho_torneio=3)
-            
-            # Cruzamento
-            filho1, filho2 = pai1.cruzar(pai2)
+        # Gera os descendentes de uma vez: seleção dos pais, cruzamento dos casais e mutação
+        num_filhos = tamanho_populacao - num_elite
+        num_pares = (num_filhos + 1) // 2
+        pais = selecao(aptidao, 2 * num_pares, config, gerador)
+        pais1, pais2 = populacao[pais[0::2]], populacao[pais[1::2]]
+        filhos1, filhos2, trocas = cruzamento(pais1, pais2, config, gerador)
+        cruzados = np.concatenate((filhos1, filhos2))[:num_filhos]
+        nova_populacao[num_elite:], inversoes = mutacao(cruzados, config, gerador)
+        
+        # Avalia apenas os descendentes, a partir dos agregados do pai de origem de cada um
+        # (pai 1 para filhos1, pai 2 para filhos2). Mudam só os genes trocados em que os pais
+        # diferem, onde cada filho recebe o valor do outro pai, e os invertidos pela mutação.
+        pares, genes_troca = np.nonzero(trocas & (pais1 != pais2))
+        sinal_troca = pais2[pares, genes_troca].astype(np.int64) * 2 - 1  # Sinal para o filho do pai 1
+        linhas_inversao, genes_inversao = np.nonzero(inversoes)
+        linhas = np.concatenate((pares, pares + num_pares, linhas_inversao))
+        genes = np.concatenate((genes_troca, genes_troca, genes_inversao))
+        sinal = np.concatenate((sinal_troca, -sinal_troca,
+                                1 - 2 * cruzados[linhas_inversao, genes_inversao].astype(np.int64)))
+        validos = linhas < num_filhos  # Com num_filhos ímpar, o último filho do pai 2 é descartado
+        origem = np.concatenate((pais[0::2], pais[1::2]))[:num_filhos]
+        agregados_filhos = _agregados_descendentes(tuple(termo[origem] for termo in agregados),
+                                                   linhas[validos], genes[validos], sinal[validos],
+                                                   catalogo, meta_calorica)
+        
+        if config.reparo_lamarckiano:
+            # Linhas reparadas mudam em muitos genes: os agregados delas são recalculados
+            reparados = obter_indice_calorico(catalogo).reparar_populacao(nova_populacao[num_elite:], meta_calorica)
+            if len(reparados):
+                recalculados = _agregados_populacao(nova_populacao[num_elite:][reparados], catalogo, meta_calorica)
+                for termo, termo_recalculado in zip(agregados_filhos, recalculados):
+                    termo[reparados] = termo_recalculado
+        agregados = tuple(np.concatenate((termo[:num_elite], termo_filhos))
+                          for termo, termo_filhos in zip(agregados, agregados_filhos))
+        nova_aptidao = np.empty_like(aptidao)
+        nova_aptidao[:num_elite] = aptidao[:num_elite]
+        nova_aptidao[num_elite:] = _fitness_agregados(*agregados_filhos, meta_calorica)
+        populacao, aptidao = nova_populacao, nova_aptidao
+        avaliacoes += num_filhos
+        
+        if telemetria is not None:
+            telemetria.registrar(geracao + 1, populacao, aptidao, num_filhos, 0)
+        if controle is not None and controle.verificar(populacao, aptidao):
+            break
+    
+    return populacao, aptidao, avaliacoes, 0
+
+def _evoluir_estacionario(populacao: np.ndarray, aptidao: np.ndarray, catalogo: CatalogoAlimentos,
+                          meta_calorica: float, config: ConfiguracaoAG, geracoes: int,
+                          controle: ControleParada = None,
+                          rng=random, telemetria=None) -> Tuple[np.ndarray, np.ndarray, int, int]:
+    """AG estacionário: a cada passo, k descendentes disputam as vagas dos k piores
+    
+    Descendentes cujo genótipo já está na população (ou repetido no mesmo passo)
+    são descartados antes da avaliação, consultando um índice de genótipos, de
+    modo que nenhuma avaliação é gasta com clones; genótipos que já saíram da
+    população são buscados num CacheFitness. Uma "geração" são os passos
+    necessários para gerar tantos descendentes quanto o modo geracional.
+    """
+    tamanho_populacao = len(populacao)
+    selecao = obter_operador('selecao', config.operador_selecao)
+    cruzamento = obter_operador('cruzamento', config.operador_cruzamento)
+    mutacao = obter_operador('mutacao', config.operador_mutacao)
+    gerador = np.random.default_rng(rng.getrandbits(64))
+    
+    num_elite = max(1, int(tamanho_populacao * config.taxa_elitismo))
+    k = min(config.substituicoes_por_passo or max(1, tamanho_populacao // 2), tamanho_populacao - 1)
+    passos_por_geracao = max(1, -(-(tamanho_populacao - num_elite) // k))
+    num_pares = (k + 1) // 2
+    
+    populacao, aptidao = populacao.copy(), aptidao.copy()
+    cache = CacheFitness()
+    chaves = chave_genotipo(populacao)
+    contagem = {}  # Genótipo -> cópias na população
+    for chave, fitness in zip(chaves, aptidao):
+        contagem[chave] = contagem.get(chave, 0) + 1
+        cache.guardar((chave, meta_calorica), float(fitness))
+    
+    for geracao in range(geracoes):
+        falhas, acertos = cache.falhas, cache.acertos
+        for passo in range(passos_por_geracao):
+            pais = populacao[selecao(aptidao, 2 * num_pares, config, gerador)]
+            filhos1, filhos2, _ = cruzamento(pais[0::2], pais[1::2], config, gerador)
+            filhos, _ = mutacao(np.concatenate((filhos1, filhos2))[:k], config, gerador)
+            if config.reparo_lamarckiano:
+                obter_indice_calorico(catalogo).reparar_populacao(filhos, meta_calorica)
             
-            # Mutação
-            if random.random() < taxa_mutacao:
-                filho1.mutar(taxa_mutacao)
-            if random.random() < taxa_mutacao:
-                filho2.mutar(taxa_mutacao)
+            # Descarta clones antes de avaliar
+            novos, chaves_novas = [], []
+            for i, chave in enumerate(chave_genotipo(filhos)):
+                if chave not in contagem and chave not in chaves_novas:
+                    novos.append(i)
+                    chaves_novas.append(chave)
+            if not novos:
+                continue
+            filhos = filhos[novos]
+            aptidao_filhos = _avaliar_com_cache(filhos, catalogo, meta_calorica, cache)
             
-            nova_populacao.append(filho1)
-            if len(nova_populacao) < tamanho_populacao:
-                nova_populacao.append(filho2)
+            # Os piores da população e os descendentes disputam as mesmas vagas
+            piores = np.argpartition(aptidao, len(novos) - 1)[:len(novos)]
+            candidatos = np.concatenate((aptidao[piores], aptidao_filhos))
+            vencedores = np.argsort(-candidatos, kind='stable')[:len(novos)]
+            permanecem = set(vencedores.tolist())
+            entram = [v - len(novos) for v in vencedores if v >= len(novos)]
+            saem = [piores[j] for j in range(len(novos)) if j not in permanecem]
+            for vaga, filho in zip(saem, entram):
+                antiga = chaves[vaga]
+                contagem[antiga] -= 1
+                if contagem[antiga] == 0:
+                    del contagem[antiga]
+                chaves[vaga] = chaves_novas[filho]
+                contagem[chaves_novas[filho]] = 1
+                populacao[vaga] = filhos[filho]
+                aptidao[vaga] = aptidao_filhos[filho]
         
-        populacao = nova_populacao[:tamanho_populacao]
+        if telemetria is not None:
+            # Cada falha do cache é um genótipo inédito avaliado (os clones já foram descartados)
+            telemetria.registrar(geracao + 1, populacao, aptidao, cache.falhas - falhas, cache.acertos - acertos)
+        if controle is not None and controle.verificar(populacao, aptidao):
+            break
+    
+    return populacao, aptidao, cache.falhas, cache.acertos
+
+def _motor_ag(catalogo: CatalogoAlimentos, meta_calorica: float, config: ConfiguracaoAG,
+              sessao: SessaoOtimizador) -> np.ndarray:
+    """Motor padrão: algoritmo genético (população única, modelo de ilhas ou codificação esparsa)"""
+    if config.codificacao == 'esparsa':
+        from src.utils.esparsa_utils import motor_esparso
+        return motor_esparso(catalogo, meta_calorica, config, sessao)
+    if config.codificacao != 'binaria':
+        raise ValueError(f"Codificação desconhecida: {config.codificacao}")
+    controle = ControleParada(config)
+    
+    # Aquecimento: parte da população final da semana anterior, com menos gerações
+    semente = _obter_semente_populacao(sessao, catalogo, config)
+    if semente is not None and config.geracoes_reaproveitamento is not None:
+        config = replace(config, geracoes=config.geracoes_reaproveitamento)
+    
+    # Semeadura heurística: ocupa as últimas vagas da semente (o restante segue aleatório)
+    num_semeados = min(config.tamanho_populacao, int(round(config.fracao_semeadura * config.tamanho_populacao)))
+    if num_semeados > 0:
+        from src.utils.semeadura_utils import semear_populacao
+        semeados = semear_populacao(catalogo, meta_calorica, num_semeados,
+                                    np.random.default_rng(sessao.rng.getrandbits(64)))
+        if semente is not None:
+            semeados = np.concatenate((semente[:config.tamanho_populacao - num_semeados], semeados))
+        semente = semeados
+    
+    telemetria = sessao.telemetria
+    if config.num_ilhas > 1:
+        from src.utils.ilhas_utils import evoluir_ilhas
+        if telemetria is not None:
+            telemetria.iniciar_execucao()
+        populacao, aptidao = evoluir_ilhas(catalogo, meta_calorica, config, controle, semente, sessao.rng,
+                                           telemetria)
+    else:
+        if telemetria is not None:
+            telemetria.iniciar_execucao()
+        populacao = _populacao_inicial(config.tamanho_populacao, len(catalogo), semente, sessao.rng)
+        if config.reparo_lamarckiano:
+            obter_indice_calorico(catalogo).reparar_populacao(populacao, meta_calorica)
+        aptidao = _fitness_vetorizado(populacao, catalogo, meta_calorica)
+        if telemetria is not None:
+            telemetria.registrar(0, populacao, aptidao, len(populacao), 0)
+        populacao, aptidao, _, _ = _evoluir_populacao(populacao, aptidao, catalogo, meta_calorica,
+                                                      config, config.geracoes, controle, sessao.rng, telemetria)
+    if telemetria is not None:
+        telemetria.finalizar_execucao()
+    sessao.contadores_parada[controle.motivo] += 1
     
-    # Obtém a melhor solução
-    populacao.sort(key=lambda x: x.fitness, reverse=True)
-    melhor_individuo = populacao[0]
+    if config.reaproveitar_populacao:
+        _guardar_semente_populacao(sessao, catalogo, populacao, aptidao, config)
+    
+    return populacao[int(np.argmax(aptidao))]
+
+# Motores de otimização disponíveis para mochila_alimentos: nome -> função
+# (catalogo, meta_calorica, config, sessao) que devolve o melhor cromossomo (vetor 0/1)
+_MOTORES = {'ag': _motor_ag}
+
+# Módulos que registram motores adicionais quando importados pela primeira vez
+_MODULOS_MOTORES = {
+    'milp': 'src.utils.milp_utils',
+    'enumeracao': 'src.utils.enumeracao_utils',
+    'fronteira': 'src.utils.fronteira_utils',
+    'aco': 'src.utils.aco_utils',
+}
+
+def registrar_motor(nome: str, motor):
+    """Registra um motor de otimização selecionável em mochila_alimentos"""
+    _MOTORES[nome] = motor
+
+def _obter_motor(nome: str):
+    if nome not in _MOTORES and nome in _MODULOS_MOTORES:
+        importlib.import_module(_MODULOS_MOTORES[nome])
+    if nome not in _MOTORES:
+        raise ValueError(f"Motor de otimização desconhecido: {nome}")
+    return _MOTORES[nome]
+
+def _resolver_cromossomo(catalogo: CatalogoAlimentos, meta_calorica: float, config: ConfiguracaoAG,
+                         motor: str, sessao: SessaoOtimizador) -> np.ndarray:
+    """Executa o motor para a meta (com a poda do cardápio, se ativa) e devolve o cromossomo"""
+    if config.podar_catalogo:
+        from src.utils.poda_utils import obter_catalogo_podado
+        podado = obter_catalogo_podado(catalogo, meta_calorica)
+        sessao.ultima_poda = podado.resumo()
+        return podado.expandir(_obter_motor(motor)(podado.catalogo, meta_calorica, config, sessao))
+    return _obter_motor(motor)(catalogo, meta_calorica, config, sessao)
+
+def mochila_alimentos(alimentos: List[AlimentoItem], capacidade_calorica: float, usar_elitismo: bool = True,
+                      config: ConfiguracaoAG = None, motor: str = None,
+                      cache_solucoes: CacheSolucoes = None,
+                      sessao: SessaoOtimizador = None) -> List[AlimentoItem]:
+    """Otimiza a seleção de alimentos (algoritmo genético por padrão) com elitismo
+    
+    Args:
+        alimentos: Lista de AlimentoItem disponíveis
+        capacidade_calorica: Meta calórica diária
+        usar_elitismo: Mantém a melhor dieta entre execuções consecutivas
+        config: Parâmetros do algoritmo genético
+        motor: Motor de otimização ('ag' = algoritmo genético, 'milp' = programação inteira,
+            'enumeracao' = enumeração exaustiva, 'fronteira' = tabela pré-calculada,
+            'aco' = colônia de formigas)
+        cache_solucoes: Cache de dietas por cardápio/meta arredondada; num acerto o motor não é executado
+        sessao: Estado da simulação (elitismo, histórico, RNG); config, motor e cache_solucoes
+            não informados vêm dela. Sem sessão, usa a sessão padrão do módulo.
+    """
+    sessao = sessao if sessao is not None else _sessao_padrao
+    config = config if config is not None else sessao.config
+    motor = motor if motor is not None else sessao.motor
+    cache_solucoes = cache_solucoes if cache_solucoes is not None else sessao.cache_solucoes
+    melhor_solucao = sessao.melhor_solucao
+
+    variacao = sessao.rng.uniform(-2, 2)
+    capacidade_calorica = max(1500, min(3500, capacidade_calorica + variacao))
+    
+    # ====== OTIMIZAÇÃO ======
+    catalogo = compilar_catalogo(alimentos)
+    bits = None
+    if cache_solucoes is not None:
+        chave_solucao = cache_solucoes.chave(catalogo.assinatura, capacidade_calorica, motor, config)
+        bits = cache_solucoes.obter(chave_solucao)
+    
+    if bits is not None:
+        melhor_cromossomo = Cromossomo(bits, len(catalogo)).para_array()
+    else:
+        melhor_cromossomo = _resolver_cromossomo(catalogo, capacidade_calorica, config, motor, sessao)
+        if cache_solucoes is not None:
+            cache_solucoes.guardar(chave_solucao, Cromossomo.de_array(melhor_cromossomo).bits)
     
     selecionados = [alimentos[i] for i in range(len(alimentos)) 
-                   if melhor_individuo.cromossomo[i] == 1]
+                   if melhor_cromossomo[i] == 1]
     
     calorias_total = sum(a.calorias for a in selecionados)
-    score_atual = melhor_individuo.fitness
+    score_atual = float(_fitness_vetorizado(melhor_cromossomo.reshape(1, -1), catalogo, capacidade_calorica)[0])
     
     # ====== IMPLEMENTAÇÃO DE ELITISMO MULTI-EXECUÇÃO ======
-    if usar_elitismo and _melhor_solucao_cache['alimentos'] is not None:
-        melhor_score = _melhor_solucao_cache['score']
-        peso_execucoes = _melhor_solucao_cache['peso_execucoes']
+    if usar_elitismo and melhor_solucao['alimentos'] is not None:
+        melhor_score = melhor_solucao['score']
+        peso_execucoes = melhor_solucao['peso_execucoes']
         
         prob_elite = min(0.90, 0.50 + (peso_execucoes * 0.20))
         
         # Se a solução atual é 2% pior, mantenha a anterior com muito alta probabilidade
         if score_atual < melhor_score * 0.98:
-            if random.random() < prob_elite:
-                selecionados = _melhor_solucao_cache['alimentos'].copy()
-                calorias_total = _melhor_solucao_cache['calorias']
+            if sessao.rng.random() < prob_elite:
+                selecionados = melhor_solucao['alimentos'].copy()
+                calorias_total = melhor_solucao['calorias']
                 score_atual = melhor_score
-                _melhor_solucao_cache['peso_execucoes'] += 1
+                melhor_solucao['peso_execucoes'] += 1
             else:
-                _melhor_solucao_cache['peso_execucoes'] = max(0, _melhor_solucao_cache['peso_execucoes'] - 1)
+                melhor_solucao['peso_execucoes'] = max(0, melhor_solucao['peso_execucoes'] - 1)
         else:
             # Solução atual é melhor
-            _melhor_solucao_cache['alimentos'] = selecionados.copy()
-            _melhor_solucao_cache['score'] = score_atual
-            _melhor_solucao_cache['calorias'] = calorias_total
-            _melhor_solucao_cache['peso_execucoes'] = 0
+            melhor_solucao['alimentos'] = selecionados.copy()
+            melhor_solucao['score'] = score_atual
+            melhor_solucao['calorias'] = calorias_total
+            melhor_solucao['peso_execucoes'] = 0
     else:
         # Primeira execução
-        _melhor_solucao_cache['alimentos'] = selecionados.copy()
-        _melhor_solucao_cache['score'] = score_atual
-        _melhor_solucao_cache['calorias'] = calorias_total
-        _melhor_solucao_cache['peso_execucoes'] = 0
-    
-    calorias_total = sum(a.calorias for a in selecionados)
-    if not (capacidade_calorica * 0.90 <= calorias_total <= capacidade_calorica * 1.10):
-        alimentos_nao_selecionados = [a for a in alimentos if a not in selecionados]
-        
-        if calorias_total < capacidade_calorica * 0.90:
-            alimentos_nao_selecionados.sort(key=lambda x: x.calorias)
-            for alimento in alimentos_nao_selecionados:
-                if calorias_total + alimento.calorias <= capacidade_calorica * 1.10:
-                    selecionados.append(alimento)
-                    calorias_total += alimento.calorias
-                if calorias_total >= capacidade_calorica * 0.90:
-                    break
-        
-        elif calorias_total > capacidade_calorica * 1.10:
-            selecionados.sort(key=lambda x: x.calorias, reverse=True)
-            while calorias_total > capacidade_calorica * 1.10 and len(selecionados) > 4:
-                removed = selecionados.pop(0)
-                calorias_total -= removed.calorias
+        melhor_solucao['alimentos'] = selecionados.copy()
+        melhor_solucao['score'] = score_atual
+        melhor_solucao['calorias'] = calorias_total
+        melhor_solucao['peso_execucoes'] = 0
     
-
+    # Reparo da janela de ±10% sobre o índice ordenado por calorias
+    selecionados = obter_indice_calorico(catalogo).reparar_alimentos(selecionados, capacidade_calorica)
     calorias_final = sum(a.calorias for a in selecionados)
-    adicionar_dieta_historico(selecionados, calorias_final)
+    sessao.adicionar_dieta_historico(selecionados, calorias_final, catalogo)
     
     return selecionados
 
-def _torneio_selecao(populacao: List[IndividuoGenetico], tamanho_torneio: int = 3) -> IndividuoGenetico:
-    torneio = random.sample(populacao, min(tamanho_torneio, len(populacao)))
-    return max(torneio, key=lambda x: x.fitness)
-
-
 def resetar_cache_elitismo():
-    global _melhor_solucao_cache, _historico_dietas
-    _melhor_solucao_cache = {
-        'alimentos': None,
-        'score': -float('inf'),
-        'calorias': 0,
-        'peso_execucoes': 0
-    }
-    _historico_dietas = []
+    """Reinicia a sessão padrão"""
+    _sessao_padrao.resetar()
 
-def obter_historico_dietas() -> List[dict]:
+def obter_contadores_parada() -> dict:
+    """Quantas execuções do AG da sessão padrão terminaram por cada critério desde o último reset"""
+    return _sessao_padrao.obter_contadores_parada()
 
-    global _historico_dietas
-    return _historico_dietas.copy()
+def obter_historico_dietas() -> List[dict]:
+    return _sessao_padrao.obter_historico_dietas()
 
 def adicionar_dieta_historico(alimentos: List[AlimentoItem], calorias: float):
-
-    global _historico_dietas
-    
-
-    id_dieta = tuple(sorted([a.nome for a in alimentos]))
-    
-
-    for dieta in _historico_dietas:
-        if dieta['id'] == id_dieta:
-            return
-    
-
-    _historico_dietas.append({
-        'id': id_dieta,
-        'alimentos': alimentos.copy(),
-        'calorias': calorias
-    })
-    
-    # Manter apenas as 10 mais recentes
-    if len(_historico_dietas) > 10:
-        _historico_dietas.pop(0)
\ No newline at end of file
+    _sessao_padrao.adicionar_dieta_historico(alimentos, calorias)
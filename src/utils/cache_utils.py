@@ -0,0 +1,115 @@
+from typing import Hashable, Optional
+from collections import OrderedDict
+import hashlib
+import sqlite3
+import threading
+import time
+
+class CacheLRU:
+    """Cache LRU limitado em memória, com contadores de acertos, falhas e remoções"""
+    def __init__(self, capacidade: int = 4096):
+        self.capacidade = capacidade
+        self._dados: OrderedDict = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def obter(self, chave: Hashable):
+        valor = self._dados.get(chave)
+        if valor is None:
+            self.falhas += 1
+            return None
+        self._dados.move_to_end(chave)
+        self.acertos += 1
+        return valor
+
+    def guardar(self, chave: Hashable, valor):
+        self._dados[chave] = valor
+        self._dados.move_to_end(chave)
+        if len(self._dados) > self.capacidade:
+            self._dados.popitem(last=False)
+            self.remocoes += 1
+
+    def __len__(self) -> int:
+        return len(self._dados)
+
+class CacheSolucoes:
+    """Cache de dietas em dois níveis: LRU em memória e SQLite em disco
+
+    A chave combina a assinatura do cardápio, a meta calórica arredondada para
+    um passo (passo_kcal) e as configurações do motor, de modo que metas quase
+    iguais, em simulações e usuários diferentes, reaproveitam a mesma dieta.
+    O valor guardado é o bitmask dos alimentos escolhidos.
+    """
+    def __init__(self, caminho: Optional[str] = None, passo_kcal: float = 10,
+                 capacidade_memoria: int = 1024, capacidade_disco: int = 100_000):
+        self.passo_kcal = passo_kcal
+        self.capacidade_disco = capacidade_disco
+        self.memoria = CacheLRU(capacidade_memoria)
+        self.acertos_disco = 0
+        self.remocoes_disco = 0
+        self._trava = threading.Lock()
+        self._conexao = None
+        if caminho is not None:
+            self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS solucoes (chave TEXT PRIMARY KEY, bits TEXT NOT NULL, acesso REAL NOT NULL)"
+            )
+            self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_solucoes_acesso ON solucoes (acesso)")
+            self._conexao.commit()
+
+    def chave(self, assinatura_catalogo: str, meta_calorica: float, motor: str, configuracao) -> str:
+        """Chave da dieta: cardápio + meta arredondada + motor e suas configurações"""
+        meta_arredondada = round(meta_calorica / self.passo_kcal) * self.passo_kcal
+        configuracao_hash = hashlib.sha1(f"{motor}|{configuracao!r}".encode('utf-8')).hexdigest()[:16]
+        return f"{assinatura_catalogo}:{meta_arredondada:g}:{configuracao_hash}"
+
+    def obter(self, chave: str) -> Optional[int]:
+        with self._trava:
+            bits = self.memoria.obter(chave)
+            if bits is not None or self._conexao is None:
+                return bits
+
+            linha = self._conexao.execute("SELECT bits FROM solucoes WHERE chave = ?", (chave,)).fetchone()
+            if linha is None:
+                return None
+            self.acertos_disco += 1
+            self._conexao.execute("UPDATE solucoes SET acesso = ? WHERE chave = ?", (time.time(), chave))
+            self._conexao.commit()
+            bits = int(linha[0], 16)
+            self.memoria.guardar(chave, bits)
+            return bits
+
+    def guardar(self, chave: str, bits: int):
+        with self._trava:
+            self.memoria.guardar(chave, bits)
+            if self._conexao is None:
+                return
+
+            self._conexao.execute("INSERT OR REPLACE INTO solucoes (chave, bits, acesso) VALUES (?, ?, ?)",
+                                  (chave, format(bits, 'x'), time.time()))
+            excesso = self._conexao.execute("SELECT COUNT(*) FROM solucoes").fetchone()[0] - self.capacidade_disco
+            if excesso > 0:
+                # Remove as dietas acessadas há mais tempo
+                self._conexao.execute(
+                    "DELETE FROM solucoes WHERE chave IN (SELECT chave FROM solucoes ORDER BY acesso LIMIT ?)",
+                    (excesso,))
+                self.remocoes_disco += excesso
+            self._conexao.commit()
+
+    def estatisticas(self) -> dict:
+        """Contadores de acertos, falhas e remoções de cada nível"""
+        return {
+            'acertos_memoria': self.memoria.acertos,
+            'acertos_disco': self.acertos_disco,
+            'falhas': self.memoria.falhas - self.acertos_disco,
+            'remocoes_memoria': self.memoria.remocoes,
+            'remocoes_disco': self.remocoes_disco,
+            'tamanho_memoria': len(self.memoria),
+        }
+
+    def fechar(self):
+        with self._trava:
+            if self._conexao is not None:
+                self._conexao.close()
+                self._conexao = None
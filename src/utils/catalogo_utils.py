@@ -0,0 +1,199 @@
+from typing import Callable, Dict, Hashable, List, Tuple
+from functools import lru_cache
+import hashlib
+import threading
+import weakref
+import numpy as np
+from src.entities.alimento import AlimentoItem
+
+# Palavras-chave que identificam cada categoria de alimento
+CATEGORIAS_ALIMENTOS = {
+    'proteinas': ['frango', 'ovo', 'peixe', 'carne', 'leite', 'queijo'],
+    'carboidratos': ['arroz', 'batata', 'quinoa', 'aveia', 'pão'],
+    'leguminosas': ['feijão', 'lentilha', 'grão'],
+    'vegetais': ['brócolis', 'espinafre', 'cenoura'],
+    'frutas': ['banana', 'maçã', 'laranja', 'abacate'],
+    'gorduras': ['azeite', 'castanha', 'amendoim']
+}
+
+# Multiplicador da pontuação nutricional por categoria
+MULTIPLICADORES_CATEGORIA = {
+    'proteinas': 1.4,      # Proteínas são essenciais
+    'carboidratos': 1.3,   # Carboidratos para energia
+    'leguminosas': 1.35,   # Boa fonte de proteína e fibras
+    'vegetais': 1.25,      # Vitaminas e minerais
+    'frutas': 1.2,         # Vitaminas e fibras
+    'gorduras': 1.15,      # Gorduras boas, mas em menor quantidade
+}
+
+# Ordem das categorias: o id de uma categoria é sua posição nesta tupla
+CATEGORIAS = tuple(CATEGORIAS_ALIMENTOS)
+ID_OUTRO = len(CATEGORIAS)
+
+# Faixas calóricas da porção em relação a 1/3 da meta (uma refeição)
+FAIXA_ADEQUADA = 0   # |calorias - meta/3| <= 100 → bônus de 1.2
+FAIXA_NEUTRA = 1     # sem ajuste
+FAIXA_EXCESSIVA = 2  # calorias > 1.5 × meta/3 → penalidade de 0.8
+FATORES_FAIXA = np.array([1.2, 1.0, 0.8])
+
+def cardapio_padrao() -> List[AlimentoItem]:
+    """Cardápio padrão da aplicação (porções de 100 g)"""
+    return [
+        AlimentoItem("Frango Grelhado", 165, 100),
+        AlimentoItem("Ovo", 155, 100),
+        AlimentoItem("Peixe", 206, 100),
+        AlimentoItem("Carne Magra", 213, 100),
+        AlimentoItem("Arroz Integral", 130, 100),
+        AlimentoItem("Batata Doce", 86, 100),
+        AlimentoItem("Quinoa", 120, 100),
+        AlimentoItem("Aveia", 389, 100),
+        AlimentoItem("Feijão Preto", 77, 100),
+        AlimentoItem("Lentilha", 116, 100),
+        AlimentoItem("Grão de Bico", 164, 100),
+        AlimentoItem("Brócolis", 55, 100),
+        AlimentoItem("Espinafre", 23, 100),
+        AlimentoItem("Cenoura", 41, 100),
+        AlimentoItem("Banana", 89, 100),
+        AlimentoItem("Maçã", 52, 100),
+        AlimentoItem("Laranja", 47, 100),
+        AlimentoItem("Abacate", 160, 100),
+        AlimentoItem("Azeite", 884, 100),
+        AlimentoItem("Castanha", 553, 100),
+        AlimentoItem("Amendoim", 567, 100),
+        AlimentoItem("Leite Desnatado", 42, 100),
+        AlimentoItem("Iogurte", 59, 100),
+        AlimentoItem("Queijo Branco", 264, 100),
+    ]
+
+@lru_cache(maxsize=4096)
+def classificar_nome(nome: str) -> Tuple[int, float]:
+    """Classifica um alimento pelo nome uma única vez
+
+    Returns:
+        (id_categoria, multiplicador) - o id é o da primeira categoria encontrada
+        (ID_OUTRO se nenhuma) e o multiplicador é o produto de todas as categorias
+        encontradas no nome
+    """
+    nome_lower = nome.lower()
+    id_categoria = ID_OUTRO
+    multiplicador = 1.0
+    for i, (categoria, alimentos) in enumerate(CATEGORIAS_ALIMENTOS.items()):
+        if any(alim in nome_lower for alim in alimentos):
+            if id_categoria == ID_OUTRO:
+                id_categoria = i
+            multiplicador *= MULTIPLICADORES_CATEGORIA[categoria]
+    return id_categoria, multiplicador
+
+def faixa_porcao(calorias, meta_calorica: float):
+    """Faixa calórica da porção (escalar ou array) em relação à meta diária"""
+    calorias_ideais_refeicao = meta_calorica / 3  # Divide em 3 refeições
+    return np.where(np.abs(calorias - calorias_ideais_refeicao) <= 100, FAIXA_ADEQUADA,
+                    np.where(calorias > calorias_ideais_refeicao * 1.5, FAIXA_EXCESSIVA, FAIXA_NEUTRA))
+
+class CatalogoAlimentos:
+    """Índice compilado de um cardápio: atributos de cada alimento em arrays
+
+    Substitui as buscas por substring repetidas a cada avaliação. As colunas de
+    todos os arrays seguem a ordem da lista de alimentos original.
+    """
+    def __init__(self, alimentos: List[AlimentoItem]):
+        self.alimentos = list(alimentos)
+        self.posicoes = {id(alimento): i for i, alimento in enumerate(alimentos)}  # Objeto -> coluna
+        self.calorias = np.array([a.calorias for a in alimentos], dtype=np.float64)
+
+        classificacao = [classificar_nome(a.nome) for a in alimentos]
+        self.categorias = np.array([c for c, _ in classificacao], dtype=np.int64)
+        self.multiplicadores = np.array([m for _, m in classificacao], dtype=np.float64)
+
+        # Matriz one-hot (alimentos × categorias); 'outro' não tem coluna
+        self.matriz_categorias = np.zeros((len(alimentos), len(CATEGORIAS)), dtype=np.int64)
+        conhecidos = self.categorias != ID_OUTRO
+        self.matriz_categorias[np.nonzero(conhecidos)[0], self.categorias[conhecidos]] = 1
+
+        # Assinatura estável entre processos, usada como chave de caches persistentes
+        conteudo = '\n'.join(f"{a.nome}\t{a.calorias}" for a in alimentos)
+        self.assinatura = hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:16]
+
+        # Parte dependente da meta calórica (recalculada só quando a meta muda), guardada
+        # como uma única tupla (meta, faixas, pontuacoes) para ser trocada atomicamente
+        # quando sessões simultâneas usam o mesmo catálogo com metas diferentes
+        self._por_meta = (None, None, None)
+
+    def __len__(self) -> int:
+        return len(self.alimentos)
+
+    def _atualizar_meta(self, meta_calorica: float) -> tuple:
+        por_meta = self._por_meta
+        if meta_calorica != por_meta[0]:
+            faixas = faixa_porcao(self.calorias, meta_calorica)
+            por_meta = (meta_calorica, faixas, self.multiplicadores * FATORES_FAIXA[faixas])
+            self._por_meta = por_meta
+        return por_meta
+
+    def faixas(self, meta_calorica: float) -> np.ndarray:
+        """Faixa calórica da porção de cada alimento para a meta dada"""
+        return self._atualizar_meta(meta_calorica)[1]
+
+    def pontuacoes(self, meta_calorica: float) -> np.ndarray:
+        """Pontuação nutricional de cada alimento para a meta dada"""
+        return self._atualizar_meta(meta_calorica)[2]
+
+    def nome_categoria(self, indice: int) -> str:
+        """Nome da categoria do alimento na posição indice"""
+        id_categoria = self.categorias[indice]
+        return CATEGORIAS[id_categoria] if id_categoria != ID_OUTRO else 'outro'
+
+# Catálogos já compilados, indexados pela identidade e atributos dos alimentos
+_catalogos: Dict[tuple, CatalogoAlimentos] = {}
+_MAX_CATALOGOS = 16
+_trava_catalogos = threading.Lock()
+
+def compilar_catalogo(alimentos: List[AlimentoItem]) -> CatalogoAlimentos:
+    """Retorna o catálogo compilado da lista, construindo-o apenas na primeira vez"""
+    chave = tuple((id(a), a.nome, a.calorias) for a in alimentos)
+    with _trava_catalogos:
+        catalogo = _catalogos.get(chave)
+        if catalogo is None:
+            if len(_catalogos) >= _MAX_CATALOGOS:
+                _catalogos.pop(next(iter(_catalogos)))
+            catalogo = CatalogoAlimentos(alimentos)
+            _catalogos[chave] = catalogo
+        return catalogo
+
+class DerivadoCatalogo:
+    """Estrutura construída a partir de um catálogo e guardada em um CachePorCatalogo
+
+    O catálogo é guardado por referência fraca: a estrutura é valor do cache cuja
+    chave é o próprio catálogo, e uma referência forte o manteria vivo para sempre.
+    """
+    def __init__(self, catalogo: CatalogoAlimentos):
+        self._catalogo = weakref.ref(catalogo)
+
+    @property
+    def catalogo(self) -> CatalogoAlimentos:
+        return self._catalogo()
+
+class CachePorCatalogo:
+    """Estruturas derivadas de cada catálogo compilado, descartadas junto com ele
+
+    construir(catalogo, *argumentos) só é chamado na primeira vez que um par
+    (catálogo, chave) é pedido; a trava evita construir a mesma estrutura em
+    duas sessões ao mesmo tempo.
+    """
+    def __init__(self, construir: Callable):
+        self._construir = construir
+        self._entradas: 'weakref.WeakKeyDictionary[CatalogoAlimentos, dict]' = weakref.WeakKeyDictionary()
+        self._trava = threading.Lock()
+
+    def obter(self, catalogo: CatalogoAlimentos, chave: Hashable = None, *argumentos):
+        with self._trava:
+            por_chave = self._entradas.setdefault(catalogo, {})
+            item = por_chave.get(chave)
+            if item is None:
+                item = self._construir(catalogo, *argumentos)
+                por_chave[chave] = item
+            return item
+
+    def __len__(self) -> int:
+        """Número de catálogos com alguma estrutura guardada"""
+        return len(self._entradas)
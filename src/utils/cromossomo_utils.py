@@ -0,0 +1,38 @@
+from typing import List
+import numpy as np
+from src.utils.cache_utils import CacheLRU
+
+class Cromossomo:
+    """Cromossomo binário compacto, armazenado como um inteiro Python
+
+    O gene i corresponde ao bit i do inteiro. Os operadores genéticos agem sobre
+    a matriz da população; o cromossomo é a forma compacta de uma linha dela
+    (dieta guardada no cache de soluções ou devolvida por um processo).
+    """
+    __slots__ = ('bits', 'tamanho')
+
+    def __init__(self, bits: int, tamanho: int):
+        self.bits = bits
+        self.tamanho = tamanho
+
+    @classmethod
+    def de_array(cls, genes: np.ndarray) -> 'Cromossomo':
+        """Cria o cromossomo a partir de uma linha 0/1 de uma matriz de população"""
+        return cls(chave_genotipo(genes.reshape(1, -1))[0], genes.shape[-1])
+
+    def para_lista(self) -> List[int]:
+        return [(self.bits >> i) & 1 for i in range(self.tamanho)]
+
+    def para_array(self) -> np.ndarray:
+        return np.array(self.para_lista(), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return self.tamanho
+
+def chave_genotipo(populacao: np.ndarray) -> List[int]:
+    """Converte cada linha 0/1 da população no inteiro do seu bitmask (gene i = bit i)"""
+    empacotado = np.packbits(populacao.astype(np.uint8), axis=1, bitorder='little')
+    return [int.from_bytes(linha.tobytes(), 'little') for linha in empacotado]
+
+class CacheFitness(CacheLRU):
+    """Cache LRU limitado de fitness, indexado por (genótipo, meta_calorica)"""
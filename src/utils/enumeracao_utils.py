@@ -0,0 +1,133 @@
+from typing import Iterator, Tuple
+from math import comb
+import numpy as np
+from src.utils.catalogo_utils import CachePorCatalogo, CatalogoAlimentos, DerivadoCatalogo
+from src.utils.alg_utils import (ConfiguracaoAG, SessaoOtimizador, _bonus_balanceamento, _bonus_variedade,
+                                 _motor_ag, _penalidade_calorica, registrar_motor)
+
+# Limite de combinações para o índice exaustivo (acima disso o motor recorre ao AG)
+LIMITE_COMBINACOES = 5_000_000
+TAMANHO_BLOCO = 65536
+
+def _combinacoes(n: int, k: int) -> np.ndarray:
+    """Todas as k-combinações de range(n), em ordem lexicográfica, geradas com NumPy
+
+    Cada passo estende as combinações de tamanho j com todos os índices maiores
+    que o último elemento, sem laços Python por combinação.
+    """
+    atuais = np.arange(n, dtype=np.int16).reshape(-1, 1)
+    for _ in range(k - 1):
+        ultimos = atuais[:, -1].astype(np.int64)
+        quantidades = n - 1 - ultimos
+        repetidas = np.repeat(atuais, quantidades, axis=0)
+        # Para cada linha, os novos elementos são ultimo+1, ..., n-1
+        inicio_linha = np.repeat(np.cumsum(quantidades) - quantidades, quantidades)
+        deslocamento = np.arange(len(repetidas)) - inicio_linha
+        novos = np.repeat(ultimos + 1, quantidades) + deslocamento
+        atuais = np.concatenate((repetidas, novos.astype(np.int16).reshape(-1, 1)), axis=1)
+    return atuais
+
+def _blocos(total: int) -> Iterator[Tuple[int, int]]:
+    for inicio in range(0, total, TAMANHO_BLOCO):
+        yield inicio, min(total, inicio + TAMANHO_BLOCO)
+
+class IndiceCombinacoes(DerivadoCatalogo):
+    """Índice exaustivo das dietas de k_min a k_max alimentos, ordenado por calorias
+
+    Tudo o que não depende da meta (calorias, bônus de variedade e de
+    balanceamento) é calculado uma única vez na construção. Para uma meta, a
+    janela de ±10% é localizada por busca binária e só as combinações dentro
+    dela têm a pontuação nutricional somada.
+    """
+    def __init__(self, catalogo: CatalogoAlimentos, k_min: int = 5, k_max: int = 7):
+        super().__init__(catalogo)
+        n = len(catalogo)
+        k_max = min(k_max, n)
+        sentinela = n  # Índice extra com atributos nulos, usado para completar combinações menores
+
+        blocos = []
+        for k in range(k_min, k_max + 1):
+            combinacoes = _combinacoes(n, k)
+            preenchimento = np.full((len(combinacoes), k_max - k), sentinela, dtype=np.int16)
+            blocos.append(np.concatenate((combinacoes, preenchimento), axis=1))
+        combinacoes = np.concatenate(blocos) if blocos else np.empty((0, k_max), dtype=np.int16)
+
+        calorias_ext = np.append(catalogo.calorias, 0.0)
+        categorias_ext = np.vstack((catalogo.matriz_categorias, np.zeros((1, catalogo.matriz_categorias.shape[1]),
+                                                                         dtype=np.int64)))
+        calorias = np.empty(len(combinacoes))
+        bonus_fixo = np.empty(len(combinacoes))
+        for inicio, fim in _blocos(len(combinacoes)):
+            bloco = combinacoes[inicio:fim]
+            num_alimentos = (bloco != sentinela).sum(axis=1)
+            calorias[inicio:fim] = calorias_ext[bloco].sum(axis=1)
+            bonus_fixo[inicio:fim] = _bonus_variedade(num_alimentos) + _bonus_balanceamento(categorias_ext[bloco].sum(axis=1))
+
+        ordem = np.argsort(calorias, kind='stable')
+        self.combinacoes = combinacoes[ordem]
+        self.calorias = calorias[ordem]
+        self.bonus_fixo = bonus_fixo[ordem]
+
+    def __len__(self) -> int:
+        return len(self.combinacoes)
+
+    def _melhores_no_intervalo(self, inicio: int, fim: int, meta_calorica: float,
+                               k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Os k maiores fitness do intervalo [inicio, fim), em ordem decrescente"""
+        pontuacoes_ext = np.append(self.catalogo.pontuacoes(meta_calorica), 0.0)
+        candidatos, fitness_candidatos = [], []
+        for bloco_inicio, bloco_fim in _blocos(fim - inicio):
+            a, b = inicio + bloco_inicio, inicio + bloco_fim
+            fitness = (pontuacoes_ext[self.combinacoes[a:b]].sum(axis=1) + self.bonus_fixo[a:b]
+                       - _penalidade_calorica(self.calorias[a:b], meta_calorica) / 100)
+            melhores = np.argpartition(-fitness, k - 1)[:k] if k < len(fitness) else np.arange(len(fitness))
+            candidatos.append(a + melhores)
+            fitness_candidatos.append(fitness[melhores])
+        candidatos = np.concatenate(candidatos)
+        fitness_candidatos = np.concatenate(fitness_candidatos)
+        ordem = np.lexsort((candidatos, -fitness_candidatos))[:k]
+        return candidatos[ordem], fitness_candidatos[ordem]
+
+    def melhores_dietas(self, meta_calorica: float, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """As k melhores dietas dentro da janela de ±10% da meta
+
+        Se nenhuma combinação cabe na janela, considera todas com a penalidade
+        calórica do fitness.
+
+        Returns:
+            (cromossomos k × alimentos, fitness de cada um)
+        """
+        inicio = int(np.searchsorted(self.calorias, meta_calorica * 0.9, side='left'))
+        fim = int(np.searchsorted(self.calorias, meta_calorica * 1.1, side='right'))
+        if fim <= inicio:
+            inicio, fim = 0, len(self)
+        indices, fitness = self._melhores_no_intervalo(inicio, fim, meta_calorica, k)
+
+        num_alimentos = len(self.catalogo)
+        cromossomos = np.zeros((len(indices), num_alimentos + 1), dtype=np.uint8)
+        cromossomos[np.arange(len(indices)).reshape(-1, 1), self.combinacoes[indices]] = 1
+        return cromossomos[:, :num_alimentos], fitness
+
+    def melhor_dieta(self, meta_calorica: float) -> np.ndarray:
+        """Cromossomo da melhor dieta dentro da janela de ±10% da meta"""
+        cromossomos, _ = self.melhores_dietas(meta_calorica, 1)
+        return cromossomos[0]
+
+def numero_combinacoes(num_alimentos: int, k_min: int = 5, k_max: int = 7) -> int:
+    return sum(comb(num_alimentos, k) for k in range(k_min, min(k_max, num_alimentos) + 1))
+
+_indices = CachePorCatalogo(IndiceCombinacoes)
+
+def obter_indice(catalogo: CatalogoAlimentos) -> IndiceCombinacoes:
+    return _indices.obter(catalogo)
+
+def motor_enumeracao(catalogo: CatalogoAlimentos, meta_calorica: float, config: ConfiguracaoAG,
+                     sessao: SessaoOtimizador) -> np.ndarray:
+    """Motor exato por enumeração exaustiva; recorre ao AG para cardápios grandes demais
+    (ou com menos de 5 alimentos)"""
+    total = numero_combinacoes(len(catalogo))
+    if total == 0 or total > LIMITE_COMBINACOES:
+        return _motor_ag(catalogo, meta_calorica, config, sessao)
+    return obter_indice(catalogo).melhor_dieta(meta_calorica)
+
+registrar_motor('enumeracao', motor_enumeracao)
@@ -0,0 +1,218 @@
+import numpy as np
+from src.utils.catalogo_utils import CatalogoAlimentos
+from src.utils.reparo_utils import obter_indice_calorico
+from src.utils.operadores_utils import obter_operador
+from src.utils.semeadura_utils import MINIMO_ALIMENTOS, MAXIMO_ALIMENTOS
+from src.utils.alg_utils import (ConfiguracaoAG, ControleParada, SessaoOtimizador, _fitness_agregados)
+
+# Codificação esparsa: cada indivíduo é uma linha com os índices (ordenados) dos
+# alimentos da dieta, completada com len(catalogo) nas posições vazias. A população
+# é uma matriz indivíduos × 7, e as tabelas do cardápio ganham uma linha extra de
+# zeros para esse índice de preenchimento: somas e contagens dispensam máscaras.
+
+class _TabelasEsparsas:
+    """Calorias, pontuações e categorias do cardápio para uma meta, com a linha de preenchimento"""
+    def __init__(self, catalogo: CatalogoAlimentos, meta_calorica: float):
+        self.num_alimentos = len(catalogo)
+        self.meta_calorica = meta_calorica
+        self.calorias = np.append(catalogo.calorias, 0.0)
+        self.pontuacoes = np.append(catalogo.pontuacoes(meta_calorica), 0.0)
+        self.categorias = np.vstack((catalogo.matriz_categorias,
+                                     np.zeros((1, catalogo.matriz_categorias.shape[1]), dtype=np.int64)))
+
+    def fitness(self, populacao: np.ndarray) -> np.ndarray:
+        """Mesmos termos de _fitness_vetorizado, com custo proporcional ao tamanho das dietas"""
+        return _fitness_agregados(self.calorias[populacao].sum(axis=1), self.pontuacoes[populacao].sum(axis=1),
+                                  (populacao < self.num_alimentos).sum(axis=1),
+                                  self.categorias[populacao].sum(axis=1), self.meta_calorica)
+
+def para_binaria(populacao: np.ndarray, num_alimentos: int) -> np.ndarray:
+    """Converte para a matriz 0/1 (indivíduos × alimentos)"""
+    matriz = np.zeros((len(populacao), num_alimentos + 1), dtype=np.uint8)
+    matriz[np.arange(len(populacao))[:, None], populacao] = 1
+    return matriz[:, :num_alimentos]
+
+def de_binaria(matriz: np.ndarray, largura: int = MAXIMO_ALIMENTOS) -> np.ndarray:
+    """Converte a matriz 0/1 para índices; alimentos além da largura são descartados"""
+    populacao = np.full((len(matriz), largura), matriz.shape[1], dtype=np.int64)
+    for linha, cromossomo in enumerate(matriz):
+        indices = np.flatnonzero(cromossomo)[:largura]
+        populacao[linha, :len(indices)] = indices
+    return populacao
+
+def diversidade_esparsa(populacao: np.ndarray, num_alimentos: int) -> float:
+    """Igual a diversidade_populacao(para_binaria(populacao)), sem montar a matriz"""
+    if not populacao.size:
+        return 0.0
+    frequencia = np.bincount(populacao.ravel(), minlength=num_alimentos + 1)[:num_alimentos] / len(populacao)
+    return float(np.sum(4 * frequencia * (1 - frequencia)) / num_alimentos)
+
+def populacao_esparsa(tamanho_populacao: int, num_alimentos: int, gerador: np.random.Generator) -> np.ndarray:
+    """Dietas aleatórias de 5-7 alimentos distintos"""
+    largura = min(MAXIMO_ALIMENTOS, num_alimentos)
+    if num_alimentos <= 4 * largura:
+        populacao = np.argsort(gerador.random((tamanho_populacao, num_alimentos)), axis=1)[:, :largura]
+    else:
+        # Cardápio grande: sorteia índices e refaz só as linhas com repetição
+        populacao = gerador.integers(0, num_alimentos, size=(tamanho_populacao, largura))
+        while True:
+            ordenados = np.sort(populacao, axis=1)
+            repetidas = (ordenados[:, 1:] == ordenados[:, :-1]).any(axis=1)
+            if not repetidas.any():
+                break
+            populacao[repetidas] = gerador.integers(0, num_alimentos, size=(int(repetidas.sum()), largura))
+    tamanhos = gerador.integers(min(MINIMO_ALIMENTOS, largura), largura + 1, size=tamanho_populacao)
+    populacao[np.arange(largura) >= tamanhos[:, None]] = num_alimentos
+    return np.sort(populacao, axis=1)
+
+def cruzamento_conjuntos(pais1: np.ndarray, pais2: np.ndarray, num_alimentos: int,
+                         gerador: np.random.Generator) -> np.ndarray:
+    """Filho com todos os alimentos comuns aos pais, completado por um sorteio dos
+    demais alimentos da união, até um tamanho sorteado dentro dos limites"""
+    largura = pais1.shape[1]
+    uniao = np.sort(np.concatenate((pais1, pais2), axis=1), axis=1)
+    repetido = np.zeros(uniao.shape, dtype=bool)
+    repetido[:, 1:] = uniao[:, 1:] == uniao[:, :-1]
+    comum = np.zeros(uniao.shape, dtype=bool)
+    comum[:, :-1] = repetido[:, 1:]  # Primeira ocorrência de um alimento dos dois pais
+    validos = (uniao < num_alimentos) & ~repetido
+
+    prioridade = gerador.random(uniao.shape)
+    prioridade[comum] = -1
+    prioridade[~validos] = 2
+    candidatos = np.take_along_axis(uniao, np.argsort(prioridade, axis=1), axis=1)[:, :largura]
+
+    num_uniao = validos.sum(axis=1)
+    minimo = np.minimum(np.maximum(min(MINIMO_ALIMENTOS, largura), (comum & validos).sum(axis=1)), num_uniao)
+    maximo = np.minimum(largura, num_uniao)
+    tamanhos = gerador.integers(minimo, maximo + 1)
+    candidatos[np.arange(largura) >= tamanhos[:, None]] = num_alimentos
+    return np.sort(candidatos, axis=1)
+
+def mutacao_esparsa(populacao: np.ndarray, num_alimentos: int, config: ConfiguracaoAG,
+                    gerador: np.random.Generator) -> np.ndarray:
+    """Troca, inserção ou remoção de um alimento, respeitando os limites de tamanho
+
+    Cada indivíduo sofre uma operação com probabilidade taxa_mutacao × 7 (a chance
+    de algum dos genes da dieta mudar); inserção em dieta cheia e remoção em dieta
+    mínima viram troca. Alimento sorteado que já está na dieta cancela a operação.
+    """
+    populacao = populacao.copy()
+    quantidade, largura = populacao.shape
+    tamanhos = (populacao < num_alimentos).sum(axis=1)
+    mutantes = gerador.random(quantidade) < min(1.0, config.taxa_mutacao * MAXIMO_ALIMENTOS)
+    operacao = gerador.integers(0, 3, size=quantidade)  # 0 = troca, 1 = inserção, 2 = remoção
+    operacao[(operacao == 1) & (tamanhos >= largura)] = 0
+    operacao[(operacao == 2) & (tamanhos <= min(MINIMO_ALIMENTOS, largura))] = 0
+    novo = gerador.integers(0, num_alimentos, size=quantidade)
+    presente = (populacao == novo[:, None]).any(axis=1)
+    posicao = (gerador.random(quantidade) * tamanhos).astype(np.int64)
+
+    linhas = np.flatnonzero(mutantes & (operacao == 0) & ~presente & (tamanhos > 0))
+    populacao[linhas, posicao[linhas]] = novo[linhas]
+    linhas = np.flatnonzero(mutantes & (operacao == 1) & ~presente)
+    populacao[linhas, tamanhos[linhas]] = novo[linhas]
+    linhas = np.flatnonzero(mutantes & (operacao == 2))
+    populacao[linhas, posicao[linhas]] = num_alimentos
+    populacao.sort(axis=1)
+    return populacao
+
+def _reparar_esparsa(populacao: np.ndarray, tabelas: _TabelasEsparsas, indice) -> int:
+    """Reparo lamarckiano no próprio array; reparos que saem dos limites de tamanho são ignorados"""
+    num_alimentos, largura = tabelas.num_alimentos, populacao.shape[1]
+    calorias_total = tabelas.calorias[populacao].sum(axis=1)
+    meta_calorica = tabelas.meta_calorica
+    fora = np.flatnonzero((calorias_total < meta_calorica * 0.90) | (calorias_total > meta_calorica * 1.10))
+    alterados = 0
+    for linha in fora:
+        indices = populacao[linha][populacao[linha] < num_alimentos].tolist()
+        reparados = sorted(indice.reparar(indices, meta_calorica))
+        if reparados != indices and min(MINIMO_ALIMENTOS, largura) <= len(reparados) <= largura:
+            populacao[linha] = num_alimentos
+            populacao[linha, :len(reparados)] = reparados
+            alterados += 1
+    return alterados
+
+def _evoluir_esparsa(catalogo: CatalogoAlimentos, meta_calorica: float, config: ConfiguracaoAG,
+                     gerador: np.random.Generator, controle: ControleParada, telemetria=None):
+    """Algoritmo genético geracional na codificação esparsa; devolve (população, aptidão)"""
+    num_alimentos, tamanho_populacao = len(catalogo), config.tamanho_populacao
+    tabelas = _TabelasEsparsas(catalogo, meta_calorica)
+    selecao = obter_operador('selecao', config.operador_selecao)
+    indice = obter_indice_calorico(catalogo) if config.reparo_lamarckiano else None
+    medir_diversidade = telemetria is not None or config.diversidade_minima is not None
+
+    populacao = populacao_esparsa(tamanho_populacao, num_alimentos, gerador)
+    num_semeados = min(tamanho_populacao, int(round(config.fracao_semeadura * tamanho_populacao)))
+    if num_semeados > 0:
+        from src.utils.semeadura_utils import semear_populacao
+        populacao[-num_semeados:] = de_binaria(semear_populacao(catalogo, meta_calorica, num_semeados, gerador),
+                                               populacao.shape[1])
+    if indice is not None:
+        _reparar_esparsa(populacao, tabelas, indice)
+    aptidao = tabelas.fitness(populacao)
+    if telemetria is not None:
+        telemetria.registrar(0, populacao, aptidao, tamanho_populacao, 0,
+                             diversidade_esparsa(populacao, num_alimentos))
+
+    num_elite = max(1, int(tamanho_populacao * config.taxa_elitismo))
+    num_filhos = tamanho_populacao - num_elite
+    num_pares = (num_filhos + 1) // 2
+    for geracao in range(config.geracoes):
+        ordem = np.argsort(-aptidao, kind='stable')
+        populacao, aptidao = populacao[ordem], aptidao[ordem]
+
+        pais = populacao[selecao(aptidao, 2 * num_pares, config, gerador)]
+        filhos = np.concatenate((cruzamento_conjuntos(pais[0::2], pais[1::2], num_alimentos, gerador),
+                                 cruzamento_conjuntos(pais[1::2], pais[0::2], num_alimentos, gerador)))
+        filhos = mutacao_esparsa(filhos[:num_filhos], num_alimentos, config, gerador)
+        if indice is not None:
+            _reparar_esparsa(filhos, tabelas, indice)
+
+        populacao = np.concatenate((populacao[:num_elite], filhos))
+        aptidao = np.concatenate((aptidao[:num_elite], tabelas.fitness(filhos)))
+
+        diversidade = diversidade_esparsa(populacao, num_alimentos) if medir_diversidade else None
+        if telemetria is not None:
+            telemetria.registrar(geracao + 1, populacao, aptidao, len(filhos), 0, diversidade)
+        if controle.verificar(populacao, aptidao, diversidade=diversidade):
+            break
+    return populacao, aptidao
+
+def _validar_config_esparsa(config: ConfiguracaoAG):
+    """Rejeita as opções do ConfiguracaoAG que a codificação esparsa não implementa"""
+    if config.num_ilhas > 1:
+        raise ValueError("A codificação esparsa não suporta o modelo de ilhas (num_ilhas > 1)")
+    if config.reaproveitar_populacao:
+        raise ValueError("A codificação esparsa não suporta reaproveitar_populacao")
+    if config.modo_evolucao != 'geracional':
+        raise ValueError(f"A codificação esparsa só suporta o modo geracional, não {config.modo_evolucao!r}")
+    # Cruzamento e mutação são os próprios da codificação; os nomes do config só são aceitos no padrão
+    for tipo, rotulo, campo in (('cruzamento', 'cruzamento', 'operador_cruzamento'),
+                                ('mutacao', 'mutação', 'operador_mutacao')):
+        nome = getattr(config, campo)
+        obter_operador(tipo, nome)
+        if nome != getattr(ConfiguracaoAG, campo):
+            raise ValueError(f"A codificação esparsa usa seu próprio operador de {rotulo}; "
+                             f"{campo}={nome!r} não se aplica")
+
+def motor_esparso(catalogo: CatalogoAlimentos, meta_calorica: float, config: ConfiguracaoAG,
+                  sessao: SessaoOtimizador) -> np.ndarray:
+    """Algoritmo genético com codificação esparsa (ConfiguracaoAG.codificacao = 'esparsa')
+
+    A memória e o custo por geração acompanham o tamanho das dietas (5-7), e não o
+    do cardápio; só a conversão do melhor indivíduo para o cromossomo 0/1 é O(cardápio).
+    Ilhas, aquecimento, modo estacionário e os operadores de cruzamento e mutação
+    binários não se aplicam a esta codificação (ValueError se forem pedidos).
+    """
+    _validar_config_esparsa(config)
+    controle = ControleParada(config)
+    gerador = np.random.default_rng(sessao.rng.getrandbits(64))
+    telemetria = sessao.telemetria
+    if telemetria is not None:
+        telemetria.iniciar_execucao()
+    populacao, aptidao = _evoluir_esparsa(catalogo, meta_calorica, config, gerador, controle, telemetria)
+    if telemetria is not None:
+        telemetria.finalizar_execucao()
+    sessao.contadores_parada[controle.motivo] += 1
+    return para_binaria(populacao[[int(np.argmax(aptidao))]], len(catalogo))[0]
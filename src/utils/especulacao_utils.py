@@ -0,0 +1,140 @@
+from typing import Dict, List, Optional, Sequence
+from dataclasses import dataclass, replace
+from concurrent.futures import Future, wait
+import os
+import random
+from src.entities.alimento import AlimentoItem
+from src.utils.catalogo_utils import compilar_catalogo
+from src.utils.cromossomo_utils import Cromossomo
+from src.utils.cache_utils import CacheSolucoes
+from src.utils.pool_utils import catalogo_trabalhador, obter_pool
+from src.utils.alg_utils import ConfiguracaoAG, SessaoOtimizador, _resolver_cromossomo
+
+# Variação aleatória que mochila_alimentos soma à meta antes de consultar o cache
+VARIACAO_MOCHILA = 2
+
+@dataclass
+class ConfiguracaoEspeculacao:
+    """Parâmetros da pré-resolução especulativa das próximas semanas"""
+    trabalhadores: Optional[int] = None  # None = núcleos disponíveis menos um (mínimo 1)
+    profundidade: int = 2  # Semanas à frente especuladas
+    largura_faixa: int = 2  # Passos do cache de cada lado da meta prevista
+    espera_maxima_s: Optional[float] = 10.0  # Espera pelos passos da semana; esgotada, a semana é resolvida localmente
+
+def _resolver_meta(meta_calorica: float, config: ConfiguracaoAG, motor: str, semente: int) -> int:
+    """Resolve uma meta no processo trabalhador; devolve o bitmask da dieta"""
+    # Ilhas dentro de um trabalhador abririam outro pool: a especulação já é o paralelismo
+    config = replace(config, num_ilhas=1)
+    sessao = SessaoOtimizador(config, motor, semente=semente)
+    cromossomo = _resolver_cromossomo(catalogo_trabalhador(), meta_calorica, config, motor, sessao)
+    return Cromossomo.de_array(cromossomo).bits
+
+class ExecutorEspeculativo:
+    """Pré-resolve em processos as metas prováveis das próximas semanas
+
+    A meta da semana seguinte depende do peso produzido pela dieta atual, mas
+    muda poucas kcal por semana. Para cada meta prevista, o executor dispara no
+    pool a resolução dos passos do cache de soluções ao redor dela (largura_faixa
+    para cada lado) e, quando a semana chega, grava no cache os resultados dos
+    passos que cobrem a meta real: mochila_alimentos encontra a dieta no cache
+    ou, se a previsão errou, resolve normalmente. Cada passo é resolvido uma só
+    vez, com semente derivada do cardápio e do passo (resultado independente da
+    ordem de chegada).
+    """
+    def __init__(self, alimentos: List[AlimentoItem], config: ConfiguracaoAG, motor: str,
+                 cache_solucoes: CacheSolucoes, especulacao: ConfiguracaoEspeculacao = None):
+        self.catalogo = compilar_catalogo(alimentos)
+        self.config = config
+        self.motor = motor
+        self.cache = cache_solucoes
+        self.especulacao = especulacao if especulacao is not None else ConfiguracaoEspeculacao()
+        trabalhadores = self.especulacao.trabalhadores or max(1, (os.cpu_count() or 2) - 1)
+        self.pool = obter_pool(self.catalogo, trabalhadores)
+        self._pendentes: Dict[int, Future] = {}
+        self._resolvidos = set()
+        self._especulados = set()
+        self._guardados = set()  # Passos especulados cujo resultado foi gravado no cache
+        self.especuladas = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.erros = 0  # Passos perdidos por falha no pool ou no trabalhador
+        self.expiradas = 0  # Passos abandonados por passar de espera_maxima_s
+
+    def _passo(self, meta_calorica: float) -> int:
+        return round(meta_calorica / self.cache.passo_kcal)
+
+    def _chave(self, passo: int) -> str:
+        return self.cache.chave(self.catalogo.assinatura, passo * self.cache.passo_kcal, self.motor, self.config)
+
+    def especular(self, metas_previstas: Sequence[float]):
+        """Dispara a resolução dos passos ao redor de cada meta prevista que ainda não estão no cache"""
+        largura = self.especulacao.largura_faixa
+        for meta in metas_previstas:
+            centro = self._passo(meta)
+            for passo in range(centro - largura, centro + largura + 1):
+                if passo in self._pendentes or passo in self._resolvidos:
+                    continue
+                meta_passo = passo * self.cache.passo_kcal
+                if not 1500 <= meta_passo <= 3500 or self.cache.obter(self._chave(passo)) is not None:
+                    self._resolvidos.add(passo)
+                    continue
+                semente = random.Random(f"{self.catalogo.assinatura}:{passo}").getrandbits(64)
+                try:
+                    self._pendentes[passo] = self.pool.submit(_resolver_meta, meta_passo, self.config,
+                                                              self.motor, semente)
+                except RuntimeError:
+                    # Pool quebrado ou encerrado: as semanas seguintes são resolvidas sem especulação
+                    self.erros += 1
+                    return
+                self._especulados.add(passo)
+                self.especuladas += 1
+
+    def confirmar(self, meta_calorica: float):
+        """Antes de resolver a semana: espera os passos que cobrem a meta e grava os resultados no cache
+
+        A espera é limitada a espera_maxima_s; os passos que não terminarem a tempo
+        são abandonados (o resultado tardio é descartado) e mochila_alimentos resolve
+        a semana localmente. Só conta como acerto a semana com algum passo especulado
+        resolvido sem erro.
+        """
+        passos = {self._passo(max(1500, min(3500, meta_calorica + variacao)))
+                  for variacao in (-VARIACAO_MOCHILA, VARIACAO_MOCHILA)}
+        passos = set(range(min(passos), max(passos) + 1))
+        cobertos = {passo: self._pendentes[passo] for passo in passos if passo in self._pendentes}
+        _, atrasados = wait(cobertos.values(), timeout=self.especulacao.espera_maxima_s)
+        for passo, futuro in cobertos.items():
+            if futuro in atrasados:
+                futuro.cancel()
+                del self._pendentes[passo]
+                self._resolvidos.add(passo)
+                self.expiradas += 1
+        self._recolher()
+        if passos & self._guardados:
+            self.acertos += 1
+        else:
+            self.falhas += 1
+
+    def _recolher(self):
+        """Grava no cache os resultados já prontos; um passo que falhou no trabalhador é descartado
+        e, se for necessário, mochila_alimentos o resolve normalmente"""
+        for passo, futuro in list(self._pendentes.items()):
+            if futuro.done():
+                del self._pendentes[passo]
+                self._resolvidos.add(passo)
+                try:
+                    bits = futuro.result()
+                except Exception:
+                    self.erros += 1
+                    continue
+                self.cache.guardar(self._chave(passo), bits)
+                self._guardados.add(passo)
+
+    def encerrar(self):
+        """Descarta as especulações ainda na fila (as já em execução terminam no pool)"""
+        for futuro in self._pendentes.values():
+            futuro.cancel()
+        self._pendentes.clear()
+
+    def estatisticas(self) -> dict:
+        return {'especuladas': self.especuladas, 'acertos': self.acertos, 'falhas': self.falhas,
+                'erros': self.erros, 'expiradas': self.expiradas}
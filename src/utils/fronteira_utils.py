@@ -0,0 +1,146 @@
+from typing import Dict, List, Optional
+import json
+import os
+import sys
+import threading
+import numpy as np
+from src.entities.alimento import AlimentoItem
+from src.utils.catalogo_utils import CatalogoAlimentos, cardapio_padrao, compilar_catalogo
+from src.utils.alg_utils import (ConfiguracaoAG, SessaoOtimizador, _fitness_vetorizado, _motor_ag, _obter_motor,
+                                 registrar_motor)
+
+# Faixa de metas alcançável: mochila_alimentos e simular_evolucao limitam a 1500-3500 kcal
+META_MINIMA = 1500
+META_MAXIMA = 3500
+
+# Local padrão da tabela do cardápio padrão, gerada por `python -m src.utils.fronteira_utils`
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                              'dados', 'fronteira_cardapio')
+
+class TabelaFronteira:
+    """Melhores dietas pré-calculadas para cada passo de meta calórica
+
+    Guarda, para cada meta da grade, os top-K cromossomos como bitmasks
+    empacotados (np.packbits) e seus fitness. A consulta é uma busca binária
+    pela meta mais próxima da grade.
+    """
+    def __init__(self, metas: np.ndarray, bits: np.ndarray, pontuacoes: np.ndarray, assinatura: str,
+                 num_alimentos: int):
+        self.metas = metas                # (metas,)
+        self.bits = bits                  # (metas, K, bytes) uint8
+        self.pontuacoes = pontuacoes      # (metas, K)
+        self.assinatura = assinatura
+        self.num_alimentos = num_alimentos
+
+    def __len__(self) -> int:
+        return len(self.metas)
+
+    @property
+    def top_k(self) -> int:
+        return self.bits.shape[1]
+
+    def _posicao(self, meta_calorica: float) -> int:
+        posicao = int(np.searchsorted(self.metas, meta_calorica))
+        if posicao == len(self.metas):
+            return posicao - 1
+        if posicao > 0 and meta_calorica - self.metas[posicao - 1] <= self.metas[posicao] - meta_calorica:
+            return posicao - 1
+        return posicao
+
+    def consultar(self, meta_calorica: float, ordem: int = 0) -> np.ndarray:
+        """Cromossomo da ordem-ésima melhor dieta para a meta mais próxima da grade"""
+        empacotado = self.bits[self._posicao(meta_calorica), ordem]
+        return np.unpackbits(empacotado, bitorder='little')[:self.num_alimentos]
+
+    def salvar(self, caminho: str):
+        """Grava a tabela no diretório caminho, um .npy por matriz (ver carregar)"""
+        os.makedirs(caminho, exist_ok=True)
+        for nome in ('metas', 'bits', 'pontuacoes'):
+            np.save(os.path.join(caminho, f'{nome}.npy'), getattr(self, nome))
+        with open(os.path.join(caminho, 'info.json'), 'w', encoding='utf-8') as arquivo:
+            json.dump({'assinatura': self.assinatura, 'num_alimentos': self.num_alimentos}, arquivo)
+
+    @classmethod
+    def carregar(cls, caminho: str) -> 'TabelaFronteira':
+        """Abre a tabela salva em caminho com as matrizes mapeadas em memória (mmap)
+
+        Nada é lido na abertura: cada consulta traz do disco só as páginas da meta consultada.
+        """
+        with open(os.path.join(caminho, 'info.json'), encoding='utf-8') as arquivo:
+            info = json.load(arquivo)
+        metas, bits, pontuacoes = (np.load(os.path.join(caminho, f'{nome}.npy'), mmap_mode='r')
+                                   for nome in ('metas', 'bits', 'pontuacoes'))
+        return cls(metas, bits, pontuacoes, info['assinatura'], info['num_alimentos'])
+
+def construir_fronteira(alimentos: List[AlimentoItem], passo_kcal: float = 1.0, top_k: int = 1,
+                        meta_minima: float = META_MINIMA, meta_maxima: float = META_MAXIMA,
+                        motor: str = 'enumeracao', config: ConfiguracaoAG = None) -> TabelaFronteira:
+    """Pré-calcula as melhores dietas de toda a faixa de metas de um cardápio
+
+    Com o motor 'enumeracao' (exato) a tabela pode guardar as top_k dietas de
+    cada meta; com outros motores registrados, apenas a melhor.
+    """
+    catalogo = compilar_catalogo(alimentos)
+    config = config if config is not None else ConfiguracaoAG()
+    metas = np.arange(meta_minima, meta_maxima + passo_kcal / 2, passo_kcal, dtype=np.float64)
+    num_bytes = (len(catalogo) + 7) // 8
+    bits = np.zeros((len(metas), top_k, num_bytes), dtype=np.uint8)
+    pontuacoes = np.full((len(metas), top_k), -np.inf)
+
+    if motor == 'enumeracao':
+        from src.utils.enumeracao_utils import obter_indice
+        indice = obter_indice(catalogo)
+        for i, meta in enumerate(metas):
+            cromossomos, fitness = indice.melhores_dietas(meta, top_k)
+            bits[i, :len(cromossomos)] = np.packbits(cromossomos, axis=1, bitorder='little')
+            pontuacoes[i, :len(fitness)] = fitness
+    else:
+        if top_k != 1:
+            raise ValueError("top_k > 1 só é suportado pelo motor 'enumeracao'")
+        executar_motor = _obter_motor(motor)
+        sessao = SessaoOtimizador(config, motor)
+        for i, meta in enumerate(metas):
+            cromossomo = executar_motor(catalogo, meta, config, sessao).reshape(1, -1)
+            bits[i, 0] = np.packbits(cromossomo, axis=1, bitorder='little')[0]
+            pontuacoes[i, 0] = _fitness_vetorizado(cromossomo, catalogo, meta)[0]
+
+    return TabelaFronteira(metas, bits, pontuacoes, catalogo.assinatura, len(catalogo))
+
+# Tabelas disponíveis por assinatura de cardápio e arquivos registrados ainda não lidos
+_tabelas: Dict[str, TabelaFronteira] = {}
+_arquivos_pendentes: List[str] = []
+_trava_tabelas = threading.Lock()
+
+def registrar_fronteira(tabela_ou_caminho):
+    """Disponibiliza uma tabela ao motor 'fronteira'
+
+    Um caminho só é lido na primeira consulta do motor (carregamento preguiçoso).
+    """
+    with _trava_tabelas:
+        if isinstance(tabela_ou_caminho, TabelaFronteira):
+            _tabelas[tabela_ou_caminho.assinatura] = tabela_ou_caminho
+        else:
+            _arquivos_pendentes.append(tabela_ou_caminho)
+
+def obter_fronteira(catalogo: CatalogoAlimentos) -> Optional[TabelaFronteira]:
+    with _trava_tabelas:
+        while _arquivos_pendentes:
+            tabela = TabelaFronteira.carregar(_arquivos_pendentes.pop(0))
+            _tabelas[tabela.assinatura] = tabela
+        return _tabelas.get(catalogo.assinatura)
+
+def motor_fronteira(catalogo: CatalogoAlimentos, meta_calorica: float, config: ConfiguracaoAG,
+                    sessao: SessaoOtimizador) -> np.ndarray:
+    """Consulta O(log n) na tabela pré-calculada; recorre ao AG se o cardápio não tiver tabela"""
+    tabela = obter_fronteira(catalogo)
+    if tabela is None:
+        return _motor_ag(catalogo, meta_calorica, config, sessao)
+    return tabela.consultar(meta_calorica)
+
+registrar_motor('fronteira', motor_fronteira)
+
+if __name__ == "__main__":
+    caminho = sys.argv[1] if len(sys.argv) > 1 else CAMINHO_PADRAO
+    tabela = construir_fronteira(cardapio_padrao())
+    tabela.salvar(caminho)
+    print(f"Tabela com {len(tabela)} metas salva em {caminho}")
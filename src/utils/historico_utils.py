@@ -0,0 +1,47 @@
+from typing import List, Sequence
+from collections import deque
+from src.utils.catalogo_utils import CatalogoAlimentos
+
+class HistoricoDietas:
+    """Histórico limitado das dietas distintas de uma simulação, em ordem de chegada
+
+    Cada dieta é guardada como índices no cardápio compilado (sem cópias de
+    AlimentoItem) e identificada pela assinatura do cardápio + bitmask dos
+    alimentos. A deduplicação é uma consulta a um conjunto e o descarte da dieta
+    mais antiga, um popleft do deque: ambos O(1), qualquer que seja a capacidade.
+    """
+    def __init__(self, capacidade: int = 10):
+        self.capacidade = capacidade
+        self._dietas = deque()  # (chave, catalogo, indices, calorias)
+        self._chaves = set()
+
+    def __len__(self) -> int:
+        return len(self._dietas)
+
+    def adicionar(self, catalogo: CatalogoAlimentos, indices: Sequence[int], calorias: float) -> bool:
+        """Registra a dieta; devolve False se ela já estiver no histórico"""
+        bits = 0
+        for i in indices:
+            bits |= 1 << i
+        chave = (catalogo.assinatura, bits)
+        if chave in self._chaves:
+            return False
+
+        self._dietas.append((chave, catalogo, tuple(indices), calorias))
+        self._chaves.add(chave)
+        if len(self._dietas) > self.capacidade:
+            antiga = self._dietas.popleft()
+            self._chaves.discard(antiga[0])
+        return True
+
+    def dietas(self) -> List[dict]:
+        """Dietas no formato usado pela interface: {'id', 'alimentos', 'calorias'}"""
+        return [{
+            'id': chave[1],
+            'alimentos': [catalogo.alimentos[i] for i in indices],
+            'calorias': calorias
+        } for chave, catalogo, indices, calorias in self._dietas]
+
+    def limpar(self):
+        self._dietas.clear()
+        self._chaves.clear()
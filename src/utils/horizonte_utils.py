@@ -0,0 +1,137 @@
+from typing import Dict, List, Optional, Sequence
+from dataclasses import dataclass
+import numpy as np
+from src.entities.alimento import AlimentoItem
+from src.utils.catalogo_utils import compilar_catalogo
+from src.utils.cromossomo_utils import chave_genotipo
+from src.utils.reparo_utils import obter_indice_calorico
+from src.utils.alg_utils import ConfiguracaoAG, SessaoOtimizador, _fitness_vetorizado, _obter_motor
+
+@dataclass
+class ConfiguracaoHorizonte:
+    """Parâmetros do planejamento conjunto das semanas (janelas deslizantes)"""
+    janela_semanas: int = 4  # Semanas planejadas juntas
+    passo_kcal: float = 50  # Metas no mesmo passo compartilham o conjunto de candidatos
+    candidatos_por_meta: int = 8  # Dietas da frente de Pareto guardadas por passo (além da do motor)
+    peso_variedade: float = 2.0  # Bônus × distância de Jaccard entre dietas de semanas seguidas
+    peso_rotacao: float = 5.0  # Penalidade por repetir a dieta da semana anterior
+    tolerancia_replanejamento: float = 0.03  # Desvio relativo da meta prevista que força novo plano
+
+class PlanejadorHorizonte:
+    """Planeja as dietas de várias semanas como um único problema
+
+    Para uma janela de semanas com metas previstas, os candidatos são as dietas
+    geradas para cada passo de meta (a melhor do motor e as melhores da frente
+    de Pareto, já reparadas para a janela calórica), guardadas para o horizonte
+    inteiro: metas próximas, na mesma janela ou em janelas futuras, reaproveitam
+    os mesmos candidatos. Todos os candidatos são avaliados em todas as metas da
+    janela, depois do reparo que a dieta servida sofrerá naquela meta, e a
+    sequência de dietas é escolhida por programação dinâmica (Viterbi) sobre
+
+        soma do fitness + peso_variedade · Jaccard(dieta anterior, dieta)
+                        - peso_rotacao · [dieta repetida]
+
+    partindo da dieta da última semana já servida. O número de otimizações
+    cresce com os passos de meta visitados, e não com o número de semanas.
+    """
+    def __init__(self, alimentos: List[AlimentoItem], horizonte: ConfiguracaoHorizonte = None,
+                 config: ConfiguracaoAG = None, motor: str = None, sessao: SessaoOtimizador = None):
+        self.alimentos = alimentos
+        self.catalogo = compilar_catalogo(alimentos)
+        self.indice = obter_indice_calorico(self.catalogo)
+        self.horizonte = horizonte if horizonte is not None else ConfiguracaoHorizonte()
+        self.sessao = sessao if sessao is not None else SessaoOtimizador()
+        self.config = config if config is not None else self.sessao.config
+        self.motor = motor if motor is not None else self.sessao.motor
+
+        self.candidatos = np.zeros((0, len(self.catalogo)), dtype=np.uint8)
+        self._chaves_candidatos = set()
+        self._passos_resolvidos = set()
+        self.otimizacoes = 0  # Execuções de motor + NSGA-II feitas até agora
+
+        self.plano: Dict[int, int] = {}  # Semana -> índice do candidato
+        self.metas_previstas: Dict[int, float] = {}
+        self.ultima_dieta: Optional[int] = None
+
+    def _reparados(self, cromossomos: np.ndarray, meta_calorica: float) -> np.ndarray:
+        """Cópia dos cromossomos como ficam depois do reparo para a meta"""
+        reparados = cromossomos.copy()
+        self.indice.reparar_populacao(reparados, meta_calorica)
+        return reparados
+
+    def _adicionar_candidatos(self, cromossomos: np.ndarray):
+        cromossomos = cromossomos[cromossomos.any(axis=1)]
+        novos = []
+        for linha, chave in enumerate(chave_genotipo(cromossomos)):
+            if chave not in self._chaves_candidatos:
+                self._chaves_candidatos.add(chave)
+                novos.append(linha)
+        if novos:
+            self.candidatos = np.concatenate((self.candidatos, cromossomos[novos]))
+
+    def _gerar_candidatos(self, meta_calorica: float):
+        """Candidatos do passo da meta: melhor dieta do motor e topo da frente de Pareto"""
+        passo = round(meta_calorica / self.horizonte.passo_kcal)
+        if passo in self._passos_resolvidos:
+            return
+        self._passos_resolvidos.add(passo)
+        meta_passo = passo * self.horizonte.passo_kcal
+        from src.utils.nsga_utils import mochila_pareto
+
+        melhor = _obter_motor(self.motor)(self.catalogo, meta_passo, self.config, self.sessao)
+        frente = mochila_pareto(self.alimentos, meta_passo, self.config, self.sessao)
+        posicoes = self.catalogo.posicoes
+        cromossomos = np.zeros((1 + min(len(frente), self.horizonte.candidatos_por_meta), len(self.catalogo)),
+                               dtype=np.uint8)
+        cromossomos[0] = melhor
+        for linha, solucao in enumerate(frente[:self.horizonte.candidatos_por_meta], start=1):
+            cromossomos[linha, [posicoes[id(a)] for a in solucao.alimentos]] = 1
+        self._adicionar_candidatos(self._reparados(cromossomos, meta_passo))
+        self.otimizacoes += 2
+
+    def precisa_planejar(self, semana: int, meta_calorica: float) -> bool:
+        """Sem plano para a semana, ou meta real longe da prevista quando o plano foi feito"""
+        if semana not in self.plano:
+            return True
+        prevista = self.metas_previstas[semana]
+        return abs(meta_calorica - prevista) > self.horizonte.tolerancia_replanejamento * prevista
+
+    def planejar(self, semana_inicial: int, metas: Sequence[float]):
+        """Planeja as semanas semana_inicial, semana_inicial+1, ... para as metas previstas"""
+        for meta in metas:
+            self._gerar_candidatos(meta)
+
+        horizonte = self.horizonte
+        candidatos = self.candidatos
+        fitness = np.stack([_fitness_vetorizado(self._reparados(candidatos, meta), self.catalogo, meta)
+                            for meta in metas])
+
+        # Transições entre candidatos: variedade (Jaccard) e rotação (repetição)
+        tamanhos = candidatos.sum(axis=1, dtype=np.int64)
+        intersecao = candidatos.astype(np.int64) @ candidatos.T.astype(np.int64)
+        uniao = tamanhos[:, None] + tamanhos[None, :] - intersecao
+        transicao = horizonte.peso_variedade * (1 - intersecao / np.maximum(uniao, 1))
+        transicao -= horizonte.peso_rotacao * np.eye(len(candidatos))
+
+        pontuacao = fitness[0].copy()
+        if self.ultima_dieta is not None:
+            pontuacao += transicao[self.ultima_dieta]
+        anteriores = np.zeros(fitness.shape, dtype=np.int64)
+        for passo in range(1, len(metas)):
+            total = pontuacao[:, None] + transicao
+            anteriores[passo] = np.argmax(total, axis=0)
+            pontuacao = total[anteriores[passo], np.arange(len(candidatos))] + fitness[passo]
+
+        escolhido = int(np.argmax(pontuacao))
+        for passo in range(len(metas) - 1, -1, -1):
+            self.plano[semana_inicial + passo] = escolhido
+            self.metas_previstas[semana_inicial + passo] = metas[passo]
+            escolhido = int(anteriores[passo, escolhido])
+
+    def dieta(self, semana: int, meta_calorica: float) -> List[AlimentoItem]:
+        """Dieta planejada da semana, reparada para a meta real e registrada no histórico"""
+        self.ultima_dieta = self.plano[semana]
+        selecionados = [self.alimentos[i] for i in np.flatnonzero(self.candidatos[self.ultima_dieta])]
+        selecionados = self.indice.reparar_alimentos(selecionados, meta_calorica)
+        self.sessao.adicionar_dieta_historico(selecionados, sum(a.calorias for a in selecionados), self.catalogo)
+        return selecionados
@@ -0,0 +1,105 @@
+from typing import List, Optional, Tuple
+from dataclasses import replace
+import math
+import os
+import random
+import numpy as np
+from src.utils.catalogo_utils import CatalogoAlimentos
+from src.utils.pool_utils import catalogo_trabalhador, obter_pool
+from src.utils.reparo_utils import obter_indice_calorico
+from src.utils.alg_utils import (ConfiguracaoAG, ControleParada, _evoluir_populacao, _fitness_vetorizado,
+                                 _populacao_inicial)
+
+def _evoluir_ilha(populacao: Optional[np.ndarray], aptidao: Optional[np.ndarray], meta_calorica: float,
+                  config: ConfiguracaoAG, geracoes: int,
+                  semente: int) -> Tuple[np.ndarray, np.ndarray, int, int]:
+    """Executa uma época de uma ilha no processo trabalhador
+    
+    Dentro da época só o prazo é verificado; os demais critérios de parada são
+    avaliados pelo processo principal entre as épocas.
+    
+    Returns:
+        (populacao, aptidao, avaliacoes, acertos_cache) da época
+    """
+    rng = random.Random(semente)
+    catalogo = catalogo_trabalhador()
+    controle = ControleParada(config) if config.prazo_ms is not None else None
+    if populacao is None:
+        populacao = _populacao_inicial(config.tamanho_populacao, len(catalogo), rng=rng)
+    avaliacoes_iniciais = 0
+    if aptidao is None:
+        if config.reparo_lamarckiano:
+            obter_indice_calorico(catalogo).reparar_populacao(populacao, meta_calorica)
+        aptidao = _fitness_vetorizado(populacao, catalogo, meta_calorica)
+        avaliacoes_iniciais = len(populacao)
+    populacao, aptidao, avaliacoes, acertos = _evoluir_populacao(populacao, aptidao, catalogo, meta_calorica,
+                                                                 config, geracoes, controle, rng)
+    return populacao, aptidao, avaliacoes_iniciais + avaliacoes, acertos
+
+def _migrar(populacoes: List[np.ndarray], aptidoes: List[np.ndarray], num_migrantes: int):
+    """Migração em anel: os melhores de cada ilha substituem os piores da ilha seguinte"""
+    melhores = []
+    for populacao, aptidao in zip(populacoes, aptidoes):
+        indices = np.argsort(-aptidao, kind='stable')[:num_migrantes]
+        melhores.append((populacao[indices].copy(), aptidao[indices].copy()))
+
+    for i, (migrantes, aptidao_migrantes) in enumerate(melhores):
+        destino = (i + 1) % len(populacoes)
+        piores = np.argsort(aptidoes[destino], kind='stable')[:len(migrantes)]
+        populacoes[destino][piores] = migrantes
+        aptidoes[destino][piores] = aptidao_migrantes
+
+def evoluir_ilhas(catalogo: CatalogoAlimentos, meta_calorica: float, config: ConfiguracaoAG,
+                  controle: ControleParada = None, semente: np.ndarray = None,
+                  rng=random, telemetria=None) -> Tuple[np.ndarray, np.ndarray]:
+    """Algoritmo genético em modelo de ilhas distribuído em um pool de processos
+
+    Cada ilha é uma população de config.tamanho_populacao indivíduos evoluída em
+    paralelo por config.intervalo_migracao gerações; entre as épocas ocorre a
+    migração em anel. Mais ilhas (e núcleos) trocam tempo de CPU por qualidade
+    da solução sem aumentar o tempo de parede. Os critérios de parada do
+    controle são verificados a cada época, sobre todas as ilhas juntas. Com uma
+    semente (aquecimento), cada ilha parte de uma fatia diferente dela. Com uma
+    TelemetriaAG, cada época é registrada como uma linha sobre todas as ilhas.
+
+    Returns:
+        (populacao, aptidao) com os indivíduos de todas as ilhas concatenados
+    """
+    num_ilhas = config.num_ilhas
+    trabalhadores = config.trabalhadores or min(num_ilhas, os.cpu_count() or 1)
+    pool = obter_pool(catalogo, trabalhadores)
+
+    populacoes: List[Optional[np.ndarray]] = [None] * num_ilhas
+    if semente is not None:
+        populacoes = [_populacao_inicial(config.tamanho_populacao, len(catalogo), semente[i::num_ilhas], rng)
+                      for i in range(num_ilhas)]
+    aptidoes: List[Optional[np.ndarray]] = [None] * num_ilhas
+    intervalo = max(1, config.intervalo_migracao)
+    epocas = max(1, math.ceil(config.geracoes / intervalo))
+    geracoes_restantes = config.geracoes
+
+    for epoca in range(epocas):
+        geracoes_epoca = min(intervalo, geracoes_restantes)
+        geracoes_restantes -= geracoes_epoca
+        config_epoca = config
+        if controle is not None and config.prazo_ms is not None:
+            restante = max(0.0, config.prazo_ms - controle.tempo_decorrido_ms())
+            config_epoca = replace(config, prazo_ms=restante)
+        tarefas = [pool.submit(_evoluir_ilha, populacoes[i], aptidoes[i], meta_calorica, config_epoca,
+                               geracoes_epoca, rng.getrandbits(32))
+                   for i in range(num_ilhas)]
+        resultados = [tarefa.result() for tarefa in tarefas]
+        populacoes = [resultado[0] for resultado in resultados]
+        aptidoes = [resultado[1] for resultado in resultados]
+        todas_populacoes, todas_aptidoes = np.concatenate(populacoes), np.concatenate(aptidoes)
+
+        if telemetria is not None:
+            telemetria.registrar(config.geracoes - geracoes_restantes, todas_populacoes, todas_aptidoes,
+                                 sum(resultado[2] for resultado in resultados),
+                                 sum(resultado[3] for resultado in resultados))
+        if controle is not None and controle.verificar(todas_populacoes, todas_aptidoes, geracoes_epoca):
+            break
+        if epoca < epocas - 1 and config.num_migrantes > 0:
+            _migrar(populacoes, aptidoes, config.num_migrantes)
+
+    return np.concatenate(populacoes), np.concatenate(aptidoes)
@@ -0,0 +1,167 @@
+from typing import List, Sequence
+import time
+import numpy as np
+from src.entities.alimento import AlimentoItem
+from src.utils.catalogo_utils import CatalogoAlimentos, FATORES_FAIXA, compilar_catalogo, faixa_porcao
+from src.utils.cromossomo_utils import Cromossomo
+from src.utils.cache_utils import CacheSolucoes
+from src.utils.reparo_utils import obter_indice_calorico
+from src.utils.operadores_utils import obter_operador
+from src.utils.alg_utils import (ConfiguracaoAG, ControleParada, SessaoOtimizador, _bonus_balanceamento,
+                                 _bonus_variedade, _penalidade_calorica, _resolver_cromossomo,
+                                 obter_sessao_padrao)
+
+def _pontuacoes_lote(catalogo: CatalogoAlimentos, metas: np.ndarray) -> np.ndarray:
+    """Pontuação nutricional de cada alimento para cada meta (metas × alimentos)"""
+    return catalogo.multiplicadores * FATORES_FAIXA[faixa_porcao(catalogo.calorias, metas.reshape(-1, 1))]
+
+def _fitness_lote(populacoes: np.ndarray, catalogo: CatalogoAlimentos, metas: np.ndarray,
+                  pontuacoes: np.ndarray) -> np.ndarray:
+    """Fitness do tensor metas × indivíduos × alimentos
+
+    Mesmos termos de _fitness_vetorizado; cada camada do tensor usa a sua meta.
+    """
+    selecao = populacoes.astype(np.float64)
+    num_alimentos = populacoes.sum(axis=2, dtype=np.int64)
+    calorias_total = selecao @ catalogo.calorias
+    pontuacao_nutricional = np.einsum('tpn,tn->tp', selecao, pontuacoes)
+    contagem = populacoes.astype(np.int64) @ catalogo.matriz_categorias
+    bonus_balanceamento = _bonus_balanceamento(contagem.reshape(-1, contagem.shape[2])).reshape(num_alimentos.shape)
+
+    fitness = (pontuacao_nutricional + _bonus_variedade(num_alimentos) + bonus_balanceamento
+               - _penalidade_calorica(calorias_total, metas.reshape(-1, 1)) / 100)
+    fitness[num_alimentos == 0] = -1000
+    return fitness
+
+def _evoluir_lote(catalogo: CatalogoAlimentos, metas: np.ndarray, config: ConfiguracaoAG,
+                  gerador: np.random.Generator, controles: List[ControleParada] = None,
+                  telemetria=None) -> np.ndarray:
+    """Algoritmo genético sobre todas as metas ao mesmo tempo
+
+    Cada meta tem sua própria população (camada do tensor metas × indivíduos ×
+    alimentos). A seleção nomeada no config sorteia os pais camada a camada; o
+    cruzamento e a mutação agem sobre os casais de todas as camadas de uma vez.
+    Com um ControleParada por meta, a camada cujo critério de parada disparar
+    deixa de evoluir, e a execução termina quando todas pararem. Com uma
+    TelemetriaAG, cada geração é registrada como uma linha sobre as camadas ativas.
+
+    Returns:
+        Melhor cromossomo de cada meta (metas × alimentos)
+    """
+    num_metas, tamanho_populacao, num_genes = len(metas), config.tamanho_populacao, len(catalogo)
+    selecao = obter_operador('selecao', config.operador_selecao)
+    cruzamento = obter_operador('cruzamento', config.operador_cruzamento)
+    mutacao = obter_operador('mutacao', config.operador_mutacao)
+    pontuacoes = _pontuacoes_lote(catalogo, metas)
+    num_elite = max(1, int(tamanho_populacao * config.taxa_elitismo))
+    num_filhos = tamanho_populacao - num_elite
+    num_pares = (num_filhos + 1) // 2
+
+    populacoes = gerador.integers(0, 2, size=(num_metas, tamanho_populacao, num_genes), dtype=np.uint8)
+    aptidoes = _fitness_lote(populacoes, catalogo, metas, pontuacoes)
+    if telemetria is not None:
+        telemetria.registrar(0, populacoes.reshape(-1, num_genes), aptidoes.ravel(), aptidoes.size, 0)
+    ativas = np.arange(num_metas)
+
+    for geracao in range(config.geracoes):
+        # Ordena cada população por fitness; os primeiros num_elite passam direto
+        ordem = np.argsort(-aptidoes[ativas], axis=1, kind='stable')
+        camadas = np.take_along_axis(populacoes[ativas], ordem[:, :, None], axis=1)
+        aptidoes_camadas = np.take_along_axis(aptidoes[ativas], ordem, axis=1)
+
+        # Seleção dos pais em cada camada; cruzamento e mutação dos casais de todas as camadas
+        pais = np.stack([selecao(aptidao, 2 * num_pares, config, gerador) for aptidao in aptidoes_camadas])
+        pais = np.take_along_axis(camadas, pais[:, :, None], axis=1)
+        filhos1, filhos2, _ = cruzamento(pais[:, 0::2].reshape(-1, num_genes), pais[:, 1::2].reshape(-1, num_genes),
+                                         config, gerador)
+        filhos = np.concatenate((filhos1.reshape(len(ativas), num_pares, num_genes),
+                                 filhos2.reshape(len(ativas), num_pares, num_genes)), axis=1)[:, :num_filhos]
+        filhos, _ = mutacao(filhos.reshape(-1, num_genes), config, gerador)
+        filhos = filhos.reshape(len(ativas), num_filhos, num_genes)
+
+        populacoes[ativas] = np.concatenate((camadas[:, :num_elite], filhos), axis=1)
+        aptidoes[ativas] = np.concatenate((aptidoes_camadas[:, :num_elite],
+                                           _fitness_lote(filhos, catalogo, metas[ativas], pontuacoes[ativas])),
+                                          axis=1)
+
+        if telemetria is not None:
+            telemetria.registrar(geracao + 1, populacoes[ativas].reshape(-1, num_genes), aptidoes[ativas].ravel(),
+                                 len(ativas) * num_filhos, 0)
+        if controles is not None:
+            paradas = np.array([controles[t].verificar(populacoes[t], aptidoes[t]) for t in ativas])
+            ativas = ativas[~paradas]
+            if len(ativas) == 0:
+                break
+
+    return populacoes[np.arange(num_metas), np.argmax(aptidoes, axis=1)]
+
+def mochila_lote(alimentos: List[AlimentoItem], capacidades_caloricas: Sequence[float],
+                 config: ConfiguracaoAG = None, motor: str = None, cache_solucoes: CacheSolucoes = None,
+                 sessao: SessaoOtimizador = None) -> List[List[AlimentoItem]]:
+    """Otimiza uma dieta para cada meta calórica em uma única execução
+
+    Para varreduras de parâmetros e Monte Carlo: com o motor 'ag', todas as metas
+    evoluem juntas em um tensor metas × indivíduos × alimentos, diluindo o custo
+    do laço Python entre as metas. Outros motores são chamados meta a meta.
+    Ao contrário de mochila_alimentos, as metas são independentes: não há
+    variação aleatória da meta, elitismo entre chamadas nem registro no
+    histórico. Do ConfiguracaoAG, o AG em lote usa os parâmetros básicos, os
+    operadores e os critérios de parada, avaliados meta a meta (ilhas,
+    codificação, modo de evolução, semeadura, reparo, poda e aquecimento não
+    se aplicam); por isso suas dietas ficam no cache de soluções sob o motor 'ag-lote', sem se
+    misturar às de mochila_alimentos. Os outros motores passam pelo mesmo
+    caminho de mochila_alimentos (incluindo a poda) e compartilham o cache.
+
+    Args:
+        alimentos: Lista de AlimentoItem disponíveis
+        capacidades_caloricas: Metas calóricas diárias (limitadas a 1500-3500 kcal)
+        config, motor, cache_solucoes, sessao: Como em mochila_alimentos
+
+    Returns:
+        Uma lista de alimentos selecionados por meta, na ordem das metas
+    """
+    sessao = sessao if sessao is not None else obter_sessao_padrao()
+    config = config if config is not None else sessao.config
+    motor = motor if motor is not None else sessao.motor
+    cache_solucoes = cache_solucoes if cache_solucoes is not None else sessao.cache_solucoes
+
+    metas = np.clip(np.asarray(capacidades_caloricas, dtype=np.float64).ravel(), 1500, 3500)
+    catalogo = compilar_catalogo(alimentos)
+    cromossomos = np.zeros((len(metas), len(catalogo)), dtype=np.uint8)
+
+    pendentes = list(range(len(metas)))
+    if cache_solucoes is not None:
+        motor_cache = 'ag-lote' if motor == 'ag' else motor
+        chaves = [cache_solucoes.chave(catalogo.assinatura, meta, motor_cache, config) for meta in metas]
+        pendentes = []
+        for i, chave in enumerate(chaves):
+            bits = cache_solucoes.obter(chave)
+            if bits is None:
+                pendentes.append(i)
+            else:
+                cromossomos[i] = Cromossomo(bits, len(catalogo)).para_array()
+
+    if pendentes:
+        if motor == 'ag':
+            gerador = np.random.default_rng(sessao.rng.getrandbits(64))
+            inicio = time.perf_counter()  # O prazo vale para o lote inteiro
+            controles = [ControleParada(config, inicio) for _ in pendentes]
+            telemetria = sessao.telemetria
+            if telemetria is not None:
+                telemetria.iniciar_execucao()
+            cromossomos[pendentes] = _evoluir_lote(catalogo, metas[pendentes], config, gerador, controles,
+                                                   telemetria)
+            if telemetria is not None:
+                telemetria.finalizar_execucao()
+            for controle in controles:
+                sessao.contadores_parada[controle.motivo] += 1
+        else:
+            for i in pendentes:
+                cromossomos[i] = _resolver_cromossomo(catalogo, metas[i], config, motor, sessao)
+        if cache_solucoes is not None:
+            for i in pendentes:
+                cache_solucoes.guardar(chaves[i], Cromossomo.de_array(cromossomos[i]).bits)
+
+    indice = obter_indice_calorico(catalogo)
+    return [[alimentos[j] for j in indice.reparar(np.flatnonzero(cromossomo).tolist(), meta)]
+            for cromossomo, meta in zip(cromossomos, metas)]
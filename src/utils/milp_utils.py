@@ -0,0 +1,106 @@
+from typing import Optional
+import threading
+import numpy as np
+from pulp import (LpBinary, LpMaximize, LpProblem, LpStatus, LpVariable, PULP_CBC_CMD, lpSum)
+from src.utils.catalogo_utils import CachePorCatalogo, CatalogoAlimentos, CATEGORIAS, DerivadoCatalogo
+from src.utils.alg_utils import ConfiguracaoAG, SessaoOtimizador, _motor_ag, registrar_motor
+
+# Bônus de presença de categoria usados no fitness (verificar_balanceamento_categorias)
+BONUS_PRESENCA = {'proteinas': 15, 'carboidratos': 15, 'vegetais': 10, 'frutas': 5}
+
+class ModeloDietaMILP(DerivadoCatalogo):
+    """Problema da dieta como programa inteiro misto, resolvido pelo CBC do PuLP
+
+    O objetivo reproduz o fitness do algoritmo genético dentro da faixa ideal
+    de 5-7 alimentos: pontuação nutricional + bônus de variedade + bônus de
+    presença por categoria - penalidade por excesso em uma categoria. A janela
+    calórica de ±10% da meta é rígida; se for inalcançável, as folgas são
+    liberadas com a mesma penalidade do fitness (1 ponto a cada 100 kcal).
+
+    O modelo é montado uma vez por catálogo e reaproveitado entre semanas:
+    a cada chamada mudam apenas os lados direitos da janela calórica (e os
+    coeficientes do objetivo, quando alguma porção muda de faixa). Como o
+    modelo é compartilhado, cada resolução é feita sob uma trava.
+    """
+    def __init__(self, catalogo: CatalogoAlimentos):
+        super().__init__(catalogo)
+        self.problema = LpProblem('dieta', LpMaximize)
+        self.x = [LpVariable(f'x_{i}', cat=LpBinary) for i in range(len(catalogo))]
+        calorias = lpSum(float(c) * x for c, x in zip(catalogo.calorias, self.x))
+        num_alimentos = lpSum(self.x)
+
+        # Folgas da janela calórica (travadas em zero enquanto a janela for viável)
+        self.folga_inferior = LpVariable('folga_inferior', lowBound=0, upBound=0)
+        self.folga_superior = LpVariable('folga_superior', lowBound=0, upBound=0)
+        self.problema += (calorias + self.folga_inferior >= 0, 'calorias_min')
+        self.problema += (calorias - self.folga_superior <= 0, 'calorias_max')
+
+        # Cardinalidade: 5-7 alimentos (faixa do bônus de variedade máximo)
+        self.problema += (num_alimentos >= 5, 'cardinalidade_min')
+        self.problema += (num_alimentos <= 7, 'cardinalidade_max')
+
+        # Presença por categoria (y_c só vale 1 se a categoria tiver algum alimento)
+        self.presenca = {}
+        self.excesso = LpVariable('excesso_categoria', lowBound=0)
+        for id_categoria, categoria in enumerate(CATEGORIAS):
+            membros = [self.x[i] for i in np.flatnonzero(catalogo.categorias == id_categoria)]
+            if categoria in BONUS_PRESENCA:
+                self.presenca[categoria] = LpVariable(f'presenca_{categoria}', cat=LpBinary)
+                self.problema += (self.presenca[categoria] <= lpSum(membros), f'minimo_{categoria}')
+            # Penalidade pela categoria mais numerosa acima de 2 alimentos
+            if membros:
+                self.problema += (self.excesso >= lpSum(membros) - 2, f'excesso_{categoria}')
+
+        self._pontuacoes: Optional[np.ndarray] = None
+        self.solver = PULP_CBC_CMD(msg=False)
+        self._trava = threading.Lock()
+
+    def _atualizar_objetivo(self, pontuacoes: np.ndarray):
+        if self._pontuacoes is not None and np.array_equal(pontuacoes, self._pontuacoes):
+            return
+        self.problema.setObjective(
+            lpSum(float(p) * x for p, x in zip(pontuacoes, self.x))
+            + lpSum(BONUS_PRESENCA[c] * y for c, y in self.presenca.items())
+            - 5 * self.excesso
+            - (self.folga_inferior + self.folga_superior) / 100
+        )
+        self._pontuacoes = pontuacoes.copy()
+
+    def resolver(self, meta_calorica: float) -> Optional[np.ndarray]:
+        """Resolve para a meta dada; devolve o cromossomo ótimo ou None se inviável"""
+        with self._trava:
+            return self._resolver(meta_calorica)
+
+    def _resolver(self, meta_calorica: float) -> Optional[np.ndarray]:
+        self._atualizar_objetivo(self.catalogo.pontuacoes(meta_calorica))
+        self.problema.constraints['calorias_min'].constant = -meta_calorica * 0.9
+        self.problema.constraints['calorias_max'].constant = -meta_calorica * 1.1
+
+        for folga in (self.folga_inferior, self.folga_superior):
+            folga.upBound = 0
+        self.problema.solve(self.solver)
+        if LpStatus[self.problema.status] != 'Optimal':
+            # Janela inalcançável: libera as folgas com a penalidade do fitness
+            for folga in (self.folga_inferior, self.folga_superior):
+                folga.upBound = None
+            self.problema.solve(self.solver)
+            if LpStatus[self.problema.status] != 'Optimal':
+                return None
+
+        return np.array([round(x.value() or 0) for x in self.x], dtype=np.uint8)
+
+_modelos = CachePorCatalogo(ModeloDietaMILP)
+
+def obter_modelo(catalogo: CatalogoAlimentos) -> ModeloDietaMILP:
+    return _modelos.obter(catalogo)
+
+def motor_milp(catalogo: CatalogoAlimentos, meta_calorica: float, config: ConfiguracaoAG,
+               sessao: SessaoOtimizador) -> np.ndarray:
+    """Motor exato por programação inteira; recorre ao AG se o modelo for inviável
+    (ex.: cardápio com menos de 5 alimentos)"""
+    cromossomo = obter_modelo(catalogo).resolver(meta_calorica)
+    if cromossomo is None:
+        return _motor_ag(catalogo, meta_calorica, config, sessao)
+    return cromossomo
+
+registrar_motor('milp', motor_milp)
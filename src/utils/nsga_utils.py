@@ -0,0 +1,188 @@
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+import numpy as np
+from src.entities.alimento import AlimentoItem
+from src.utils.catalogo_utils import CatalogoAlimentos, compilar_catalogo
+from src.utils.reparo_utils import obter_indice_calorico
+from src.utils.operadores_utils import obter_operador
+from src.utils.alg_utils import (ConfiguracaoAG, ControleParada, SessaoOtimizador, _agregados_populacao,
+                                 _bonus_balanceamento, _bonus_variedade, _fitness_agregados,
+                                 obter_sessao_padrao)
+
+# Objetivos do modo multiobjetivo, na ordem das colunas; só o desvio calórico é minimizado
+OBJETIVOS = ('desvio_calorico', 'pontuacao_nutricional', 'variedade', 'balanceamento')
+
+@dataclass
+class SolucaoPareto:
+    """Dieta não dominada da frente de Pareto"""
+    alimentos: List[AlimentoItem]
+    calorias: float
+    objetivos: Dict[str, float]
+    fitness: float  # Fitness escalar original (mesma soma ponderada do AG)
+
+def _avaliar_objetivos(populacao: np.ndarray, catalogo: CatalogoAlimentos, meta_calorica: float):
+    """Objetivos a maximizar (indivíduos × OBJETIVOS, com o desvio negado) e fitness escalar"""
+    calorias_total, pontuacao, num_alimentos, contagem = _agregados_populacao(populacao, catalogo, meta_calorica)
+    objetivos = np.column_stack((-np.abs(calorias_total - meta_calorica), pontuacao,
+                                 _bonus_variedade(num_alimentos), _bonus_balanceamento(contagem)))
+    return objetivos, _fitness_agregados(calorias_total, pontuacao, num_alimentos, contagem, meta_calorica)
+
+def ordenacao_nao_dominada(objetivos: np.ndarray) -> np.ndarray:
+    """Ordenação rápida por dominância (todos os objetivos maximizados)
+
+    Monta a matriz de dominância indivíduos × indivíduos de uma vez e retira as
+    frentes em sequência, descontando os dominadores da frente retirada.
+
+    Returns:
+        Posto de cada indivíduo (0 = não dominado)
+    """
+    melhor_ou_igual = (objetivos[:, None, :] >= objetivos[None, :, :]).all(axis=2)
+    melhor_em_algum = (objetivos[:, None, :] > objetivos[None, :, :]).any(axis=2)
+    domina = melhor_ou_igual & melhor_em_algum  # domina[i, j]: i domina j
+
+    postos = np.full(len(objetivos), -1, dtype=np.int64)
+    dominadores = domina.sum(axis=0)
+    frente, posto = np.flatnonzero(dominadores == 0), 0
+    while len(frente):
+        postos[frente] = posto
+        dominadores[frente] = -1  # Já classificados nunca voltam a zero
+        dominadores -= domina[frente].sum(axis=0)
+        frente, posto = np.flatnonzero(dominadores == 0), posto + 1
+    return postos
+
+def distancia_aglomeracao(objetivos: np.ndarray) -> np.ndarray:
+    """Distância de aglomeração dos indivíduos de uma mesma frente (extremos = infinito)"""
+    quantidade = len(objetivos)
+    if quantidade <= 2:
+        return np.full(quantidade, np.inf)
+    ordem = np.argsort(objetivos, axis=0, kind='stable')
+    ordenados = np.take_along_axis(objetivos, ordem, axis=0)
+    amplitude = ordenados[-1] - ordenados[0]
+    lacunas = np.zeros_like(ordenados)
+    lacunas[1:-1] = (ordenados[2:] - ordenados[:-2]) / np.where(amplitude > 0, amplitude, 1)
+    lacunas[[0, -1]] = np.inf
+    contribuicoes = np.empty_like(lacunas)
+    np.put_along_axis(contribuicoes, ordem, lacunas, axis=0)
+    return contribuicoes.sum(axis=1)
+
+def _selecao_ambiental(populacao: np.ndarray, objetivos: np.ndarray, quantidade: int) -> np.ndarray:
+    """Índices dos sobreviventes, do melhor para o pior: posto, depois maior aglomeração
+
+    Genótipos repetidos ficam por último, para que clones não ocupem a frente.
+    """
+    postos = ordenacao_nao_dominada(objetivos)
+    aglomeracao = np.empty(len(populacao))
+    for posto in range(postos.max() + 1):
+        frente = np.flatnonzero(postos == posto)
+        aglomeracao[frente] = distancia_aglomeracao(objetivos[frente])
+    duplicado = np.ones(len(populacao), dtype=bool)
+    duplicado[np.unique(populacao, axis=0, return_index=True)[1]] = False
+    return np.lexsort((-aglomeracao, postos, duplicado))[:quantidade]
+
+def _evoluir_nsga(catalogo: CatalogoAlimentos, meta_calorica: float, config: ConfiguracaoAG,
+                  gerador: np.random.Generator, controle: ControleParada, telemetria=None) -> np.ndarray:
+    """NSGA-II: população final ordenada por (posto, aglomeração)"""
+    tamanho_populacao = config.tamanho_populacao
+    selecao = obter_operador('selecao', config.operador_selecao)
+    cruzamento = obter_operador('cruzamento', config.operador_cruzamento)
+    mutacao = obter_operador('mutacao', config.operador_mutacao)
+    indice = obter_indice_calorico(catalogo) if config.reparo_lamarckiano else None
+
+    populacao = gerador.integers(0, 2, size=(tamanho_populacao, len(catalogo)), dtype=np.uint8)
+    num_semeados = min(tamanho_populacao, int(round(config.fracao_semeadura * tamanho_populacao)))
+    if num_semeados > 0:
+        from src.utils.semeadura_utils import semear_populacao
+        populacao[-num_semeados:] = semear_populacao(catalogo, meta_calorica, num_semeados, gerador)
+    if indice is not None:
+        indice.reparar_populacao(populacao, meta_calorica)
+    objetivos, aptidao = _avaliar_objetivos(populacao, catalogo, meta_calorica)
+    sobreviventes = _selecao_ambiental(populacao, objetivos, tamanho_populacao)
+    populacao, objetivos, aptidao = populacao[sobreviventes], objetivos[sobreviventes], aptidao[sobreviventes]
+    if telemetria is not None:
+        telemetria.registrar(0, populacao, aptidao, tamanho_populacao, 0)
+
+    num_pares = (tamanho_populacao + 1) // 2
+    for geracao in range(config.geracoes):
+        # A população está em ordem de (posto, aglomeração): a posição serve de aptidão no torneio
+        pais = populacao[selecao(-np.arange(tamanho_populacao, dtype=np.float64), 2 * num_pares, config, gerador)]
+        filhos1, filhos2, _ = cruzamento(pais[0::2], pais[1::2], config, gerador)
+        filhos, _ = mutacao(np.concatenate((filhos1, filhos2))[:tamanho_populacao], config, gerador)
+        if indice is not None:
+            indice.reparar_populacao(filhos, meta_calorica)
+        objetivos_filhos, aptidao_filhos = _avaliar_objetivos(filhos, catalogo, meta_calorica)
+
+        # Pais e filhos competem juntos pelas vagas (elitismo do NSGA-II)
+        uniao = np.concatenate((populacao, filhos))
+        objetivos_uniao = np.concatenate((objetivos, objetivos_filhos))
+        sobreviventes = _selecao_ambiental(uniao, objetivos_uniao, tamanho_populacao)
+        populacao = uniao[sobreviventes]
+        objetivos = objetivos_uniao[sobreviventes]
+        aptidao = np.concatenate((aptidao, aptidao_filhos))[sobreviventes]
+
+        if telemetria is not None:
+            telemetria.registrar(geracao + 1, populacao, aptidao, len(filhos), 0)
+        if controle.verificar(populacao, aptidao):
+            break
+    return populacao
+
+def mochila_pareto(alimentos: List[AlimentoItem], capacidade_calorica: float, config: ConfiguracaoAG = None,
+                   sessao: SessaoOtimizador = None) -> List[SolucaoPareto]:
+    """Modo multiobjetivo de mochila_alimentos: devolve a frente de Pareto inteira
+
+    Em vez de somar os termos do fitness com pesos fixos, o NSGA-II otimiza os
+    OBJETIVOS separadamente (desvio calórico, pontuação nutricional, variedade e
+    balanceamento). Uma única execução devolve todas as dietas não dominadas; a
+    interface ou o chamador escolhe um ponto com escolher_solucao, sem otimizar
+    de novo. Não há variação aleatória da meta, elitismo entre chamadas, cache
+    de soluções nem registro no histórico; a dieta não é reparada depois.
+
+    Args:
+        alimentos: Lista de AlimentoItem disponíveis
+        capacidade_calorica: Meta calórica diária
+        config: Parâmetros (população, gerações, operadores, semeadura, reparo e parada)
+        sessao: Fornece o RNG, a telemetria e o config padrão; sem sessão, usa a sessão padrão
+
+    Returns:
+        Dietas da frente, distintas, em ordem decrescente de fitness escalar
+    """
+    sessao = sessao if sessao is not None else obter_sessao_padrao()
+    config = config if config is not None else sessao.config
+    catalogo = compilar_catalogo(alimentos)
+    if len(catalogo) == 0:
+        return []
+
+    controle = ControleParada(config)
+    gerador = np.random.default_rng(sessao.rng.getrandbits(64))
+    telemetria = sessao.telemetria
+    if telemetria is not None:
+        telemetria.iniciar_execucao()
+    populacao = _evoluir_nsga(catalogo, capacidade_calorica, config, gerador, controle, telemetria)
+    if telemetria is not None:
+        telemetria.finalizar_execucao()
+    sessao.contadores_parada[controle.motivo] += 1
+
+    populacao = np.unique(populacao[populacao.any(axis=1)], axis=0)
+    objetivos, aptidao = _avaliar_objetivos(populacao, catalogo, capacidade_calorica)
+    frente = np.flatnonzero(ordenacao_nao_dominada(objetivos) == 0)
+    frente = frente[np.argsort(-aptidao[frente], kind='stable')]
+    objetivos[:, 0] = -objetivos[:, 0]  # Desvio calórico de volta ao valor absoluto
+    return [SolucaoPareto(alimentos=[alimentos[j] for j in np.flatnonzero(populacao[i])],
+                          calorias=float(populacao[i] @ catalogo.calorias),
+                          objetivos=dict(zip(OBJETIVOS, objetivos[i].tolist())),
+                          fitness=float(aptidao[i]))
+            for i in frente]
+
+def escolher_solucao(frente: List[SolucaoPareto], pesos: Optional[Dict[str, float]] = None) -> Optional[SolucaoPareto]:
+    """Escolhe um ponto da frente sem otimizar de novo
+
+    Sem pesos, devolve a dieta de maior fitness escalar (o critério do AG). Com
+    pesos por objetivo, maximiza a soma ponderada (o desvio calórico entra
+    negativo, já que é minimizado).
+    """
+    if not frente:
+        return None
+    if pesos is None:
+        return max(frente, key=lambda solucao: solucao.fitness)
+    sinais = {objetivo: -1.0 if objetivo == 'desvio_calorico' else 1.0 for objetivo in OBJETIVOS}
+    return max(frente, key=lambda solucao: sum(sinais[objetivo] * peso * solucao.objetivos[objetivo]
+                                               for objetivo, peso in pesos.items()))
@@ -0,0 +1,94 @@
+from typing import TYPE_CHECKING, Callable, Dict, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.utils.alg_utils import ConfiguracaoAG
+
+# Operadores genéticos vetorizados: cada um age sobre a população inteira (matriz
+# indivíduos × alimentos) com poucas operações NumPy e um np.random.Generator.
+# Parâmetros extras (tamanho do torneio, taxa de mutação, ...) vêm do ConfiguracaoAG.
+# Cruzamentos e mutações devolvem também a máscara de genes trocados/invertidos,
+# usada para avaliar os descendentes por diferença em relação aos pais.
+
+def torneio(aptidao: np.ndarray, num_pais: int, config: 'ConfiguracaoAG', gerador: np.random.Generator) -> np.ndarray:
+    """Índices de num_pais vencedores de torneios
+
+    Como no torneio original (random.sample), os competidores de um torneio são
+    distintos: cada linha sorteia chaves aleatórias para a população inteira e
+    fica com as tamanho_torneio menores.
+    """
+    tamanho_torneio = min(config.tamanho_torneio, len(aptidao))
+    chaves = gerador.random((num_pais, len(aptidao)))
+    competidores = np.argpartition(chaves, tamanho_torneio - 1, axis=1)[:, :tamanho_torneio]
+    vencedores = np.argmax(aptidao[competidores], axis=1)
+    return competidores[np.arange(num_pais), vencedores]
+
+def _trocar_por_mascara(pais1: np.ndarray, pais2: np.ndarray, mascara: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Filhos em que os genes marcados vêm do outro pai"""
+    return np.where(mascara, pais2, pais1), np.where(mascara, pais1, pais2)
+
+def cruzamento_k_pontos(pais1: np.ndarray, pais2: np.ndarray, config: 'ConfiguracaoAG',
+                        gerador: np.random.Generator, k: int = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cruzamento de k pontos: os trechos entre cortes alternam de pai
+
+    Returns:
+        (filhos1, filhos2, trocas): trocas marca os genes que cada filho recebeu do outro pai
+    """
+    num_pares, num_genes = pais1.shape
+    k = config.pontos_cruzamento if k is None else k
+    cortes = gerador.integers(1, num_genes, size=(num_pares, k, 1))
+    # Um gene é trocado se estiver depois de um número ímpar de cortes
+    mascara = (np.arange(num_genes) >= cortes).sum(axis=1) % 2 == 1
+    return (*_trocar_por_mascara(pais1, pais2, mascara), mascara)
+
+def cruzamento_um_ponto(pais1: np.ndarray, pais2: np.ndarray, config: 'ConfiguracaoAG',
+                        gerador: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return cruzamento_k_pontos(pais1, pais2, config, gerador, k=1)
+
+def cruzamento_uniforme(pais1: np.ndarray, pais2: np.ndarray, config: 'ConfiguracaoAG',
+                        gerador: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cada gene vem de um dos pais com probabilidade 1/2"""
+    mascara = gerador.random(pais1.shape) < 0.5
+    return (*_trocar_por_mascara(pais1, pais2, mascara), mascara)
+
+def mutacao_bit_flip(filhos: np.ndarray, config: 'ConfiguracaoAG',
+                     gerador: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """Cada gene é invertido com probabilidade taxa_mutacao (máscara de Bernoulli)
+
+    Returns:
+        (filhos, inversoes): inversoes marca os genes invertidos
+    """
+    inversoes = gerador.random(filhos.shape) < config.taxa_mutacao
+    return filhos ^ inversoes.astype(filhos.dtype), inversoes
+
+def mutacao_dois_niveis(filhos: np.ndarray, config: 'ConfiguracaoAG',
+                        gerador: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """Regra original do AG: o indivíduo sofre mutação com probabilidade taxa_mutacao
+    e, nesse caso, cada gene é invertido com a mesma probabilidade"""
+    mutantes = gerador.random((len(filhos), 1)) < config.taxa_mutacao
+    inversoes = mutantes & (gerador.random(filhos.shape) < config.taxa_mutacao)
+    return filhos ^ inversoes.astype(filhos.dtype), inversoes
+
+# Registro por tipo de operador: nome -> função
+_OPERADORES: Dict[str, Dict[str, Callable]] = {
+    'selecao': {'torneio': torneio},
+    'cruzamento': {'um_ponto': cruzamento_um_ponto, 'k_pontos': cruzamento_k_pontos,
+                   'uniforme': cruzamento_uniforme},
+    'mutacao': {'dois_niveis': mutacao_dois_niveis, 'bit_flip': mutacao_bit_flip},
+}
+
+def registrar_operador(tipo: str, nome: str, operador: Callable):
+    """Registra um operador ('selecao', 'cruzamento' ou 'mutacao') selecionável no ConfiguracaoAG
+
+    O operador segue a assinatura dos nativos do mesmo tipo, inclusive a máscara
+    devolvida por cruzamentos e mutações.
+    """
+    if tipo not in _OPERADORES:
+        raise ValueError(f"Tipo de operador desconhecido: {tipo}")
+    _OPERADORES[tipo][nome] = operador
+
+def obter_operador(tipo: str, nome: str) -> Callable:
+    operadores = _OPERADORES.get(tipo, {})
+    if nome not in operadores:
+        raise ValueError(f"Operador de {tipo} desconhecido: {nome}")
+    return operadores[nome]
@@ -0,0 +1,85 @@
+import numpy as np
+from src.utils.catalogo_utils import CachePorCatalogo, CatalogoAlimentos, DerivadoCatalogo
+from src.utils.semeadura_utils import MAXIMO_POR_CATEGORIA
+
+class CatalogoPodado(DerivadoCatalogo):
+    """Cardápio sem os alimentos dominados, com o mapa de volta para o cardápio original
+
+    Um alimento é dominado por outro da mesma categoria com pontuação maior, por
+    uma margem que cobre a diferença de calorias (ver alimentos_nao_dominados).
+    Trocar o dominado pelo dominante mantém o número de alimentos e as categorias
+    da dieta e nunca reduz o fitness; só são removidos os alimentos com pelo menos
+    dominadores_minimos dominantes, para que haja um substituto mesmo quando a
+    dieta já tem um deles (2 por categoria não são penalizados).
+    """
+    def __init__(self, original: CatalogoAlimentos, manter: np.ndarray):
+        super().__init__(original)
+        self.tamanho_original = len(original)
+        self.originais = np.flatnonzero(manter)  # Coluna no cardápio original de cada coluna podada
+        if len(self.originais) == len(original):
+            self._podado = None
+        else:
+            self._podado = CatalogoAlimentos([original.alimentos[i] for i in self.originais])
+
+    @property
+    def original(self) -> CatalogoAlimentos:
+        return self._catalogo()
+
+    @property
+    def catalogo(self) -> CatalogoAlimentos:
+        """Cardápio podado (o próprio original quando nada foi removido)"""
+        return self._podado if self._podado is not None else self.original
+
+    @property
+    def reducao(self) -> float:
+        """Fração do genoma removida pela poda (0 = nada removido)"""
+        return 1 - len(self.originais) / self.tamanho_original if self.tamanho_original else 0.0
+
+    def expandir(self, cromossomo: np.ndarray) -> np.ndarray:
+        """Cromossomo do cardápio podado -> cromossomo do cardápio original"""
+        if self._podado is None:
+            return cromossomo
+        expandido = np.zeros(self.tamanho_original, dtype=cromossomo.dtype)
+        expandido[self.originais] = cromossomo
+        return expandido
+
+    def resumo(self) -> dict:
+        return {
+            'alimentos_originais': self.tamanho_original,
+            'alimentos_podados': len(self.originais),
+            'reducao': self.reducao,
+        }
+
+def alimentos_nao_dominados(catalogo: CatalogoAlimentos, meta_calorica: float,
+                            dominadores_minimos: int = MAXIMO_POR_CATEGORIA) -> np.ndarray:
+    """Máscara dos alimentos mantidos (dominados por menos de dominadores_minimos da mesma categoria)
+
+    i domina j se pontuação_i - pontuação_j >= |calorias_i - calorias_j| / 100 e
+    pontuação_i > pontuação_j. Com as mesmas calorias, basta pontuar mais; com
+    calorias diferentes, a margem cobre a maior variação possível da penalidade
+    calórica do fitness (desvio / 100), já que mais ou menos calorias podem tanto
+    aproximar quanto afastar a dieta da meta. Alimentos equivalentes (mesma
+    pontuação e calorias) são intercambiáveis: o de menor índice domina.
+    """
+    pontuacoes, calorias = catalogo.pontuacoes(meta_calorica), catalogo.calorias
+    manter = np.ones(len(catalogo), dtype=bool)
+    for categoria in np.unique(catalogo.categorias):
+        membros = np.flatnonzero(catalogo.categorias == categoria)
+        p, c = pontuacoes[membros], calorias[membros]
+        # domina[i, j]: i domina j
+        vantagem = p[:, None] - p[None, :]
+        diferenca_calorias = np.abs(c[:, None] - c[None, :])
+        domina = (vantagem > 0) & (vantagem >= diferenca_calorias / 100)
+        domina |= np.triu((vantagem == 0) & (diferenca_calorias == 0), k=1)
+        manter[membros] = domina.sum(axis=0) < dominadores_minimos
+    return manter
+
+# Cardápios podados por cardápio original e faixa de meta. As pontuações só dependem
+# da meta pela faixa de porção de cada alimento, então metas com as mesmas faixas
+# têm exatamente a mesma poda e compartilham a entrada.
+_podados = CachePorCatalogo(lambda catalogo, meta: CatalogoPodado(catalogo, alimentos_nao_dominados(catalogo, meta)))
+
+def obter_catalogo_podado(catalogo: CatalogoAlimentos, meta_calorica: float) -> CatalogoPodado:
+    """Cardápio podado para a meta, reaproveitado entre metas da mesma faixa"""
+    faixa = catalogo.faixas(meta_calorica).astype(np.int8).tobytes()
+    return _podados.obter(catalogo, faixa, meta_calorica)
@@ -0,0 +1,59 @@
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import threading
+import weakref
+from src.entities.alimento import AlimentoItem
+from src.utils.catalogo_utils import CatalogoAlimentos, compilar_catalogo
+
+# Catálogo do processo trabalhador, compilado uma única vez na criação do pool
+_catalogo_trabalhador: Optional[CatalogoAlimentos] = None
+
+# Pools reutilizados entre chamadas, um por (catálogo, número de processos); como
+# sessões simultâneas podem usar cardápios diferentes, um pool nunca é trocado em uso.
+# O pool é encerrado quando o catálogo é descartado (ex.: ao sair do LRU de
+# compilar_catalogo e não ser mais usado), então o número de pools vivos segue o de catálogos.
+_pools: Dict[Tuple[int, int], ProcessPoolExecutor] = {}
+_trava_pools = threading.Lock()
+
+def _inicializar_trabalhador(alimentos: List[AlimentoItem]):
+    global _catalogo_trabalhador
+    _catalogo_trabalhador = compilar_catalogo(alimentos)
+
+def catalogo_trabalhador() -> CatalogoAlimentos:
+    """Catálogo do pool, dentro de uma tarefa executada no processo trabalhador"""
+    return _catalogo_trabalhador
+
+def _descartar_pools(id_catalogo: int):
+    """Encerra os pools de um catálogo que acabou de ser descartado"""
+    with _trava_pools:
+        chaves = [chave for chave in _pools if chave[0] == id_catalogo]
+        pools = [_pools.pop(chave) for chave in chaves]
+    for pool in pools:
+        pool.shutdown(wait=False)
+
+def obter_pool(catalogo: CatalogoAlimentos, trabalhadores: int) -> ProcessPoolExecutor:
+    """Pool de processos com o catálogo já carregado em cada trabalhador"""
+    chave = (id(catalogo), trabalhadores)
+    with _trava_pools:
+        pool = _pools.get(chave)
+        if pool is not None and pool._broken:
+            # Um trabalhador morreu e o pool não aceita mais tarefas: é trocado por um novo
+            pool.shutdown(wait=False)
+            pool = None
+        if pool is None:
+            # Os trabalhadores recebem a lista de alimentos, não o catálogo: o pool
+            # guarda initargs e, com o próprio catálogo, o manteria vivo para sempre
+            pool = ProcessPoolExecutor(max_workers=trabalhadores, initializer=_inicializar_trabalhador,
+                                       initargs=(catalogo.alimentos,))
+            if not any(c[0] == chave[0] for c in _pools):
+                weakref.finalize(catalogo, _descartar_pools, chave[0])
+            _pools[chave] = pool
+        return pool
+
+def encerrar_pool():
+    """Encerra todos os pools de processos, se existirem"""
+    with _trava_pools:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True)
@@ -0,0 +1,89 @@
+from typing import List
+from bisect import bisect_right
+import numpy as np
+from src.entities.alimento import AlimentoItem
+from src.utils.catalogo_utils import CachePorCatalogo, CatalogoAlimentos, DerivadoCatalogo
+
+class IndiceCalorico(DerivadoCatalogo):
+    """Alimentos do catálogo ordenados por calorias, para reparar a janela calórica
+
+    O reparo segue a regra original de mochila_alimentos: abaixo de 90% da meta,
+    acrescenta os alimentos ainda não escolhidos do menos ao mais calórico
+    enquanto couberem em 110%; acima de 110%, retira os mais calóricos (mantendo
+    ao menos 4). A pertinência é um bitmask e o limite do que ainda cabe é
+    encontrado por busca binária, sem percorrer o cardápio inteiro.
+    """
+    def __init__(self, catalogo: CatalogoAlimentos):
+        super().__init__(catalogo)
+        ordem = np.argsort(catalogo.calorias, kind='stable')
+        self.ordem: List[int] = ordem.tolist()
+        self.calorias_ordenadas: List[float] = catalogo.calorias[ordem].tolist()
+        self.calorias: List[float] = catalogo.calorias.tolist()
+
+    def reparar(self, indices: List[int], meta_calorica: float) -> List[int]:
+        """Índices da dieta reparada (acréscimos ao final; após remoções, em ordem decrescente de calorias)"""
+        inferior, superior = meta_calorica * 0.90, meta_calorica * 1.10
+        total = sum(self.calorias[i] for i in indices)
+        if inferior <= total <= superior:
+            return list(indices)
+
+        if total < inferior:
+            membros = 0
+            for i in indices:
+                membros |= 1 << i
+            reparados = list(indices)
+            posicao = 0
+            while total < inferior:
+                # Primeira posição cujo alimento já não cabe abaixo de 110%
+                fim = bisect_right(self.calorias_ordenadas, superior - total, posicao)
+                while posicao < fim and membros >> self.ordem[posicao] & 1:
+                    posicao += 1
+                if posicao >= fim:
+                    break
+                i = self.ordem[posicao]
+                reparados.append(i)
+                total += self.calorias[i]
+                posicao += 1
+            return reparados
+
+        ordenados = sorted(indices, key=lambda i: -self.calorias[i])
+        removidos = 0
+        while total > superior and len(ordenados) - removidos > 4:
+            total -= self.calorias[ordenados[removidos]]
+            removidos += 1
+        return ordenados[removidos:]
+
+    def reparar_alimentos(self, selecionados: List[AlimentoItem], meta_calorica: float) -> List[AlimentoItem]:
+        """Reparo de uma lista de alimentos do catálogo"""
+        indices = [self.catalogo.posicoes.get(id(alimento)) for alimento in selecionados]
+        if None in indices:
+            # Alimentos de fora do cardápio (ex.: dieta de elitismo de outro cardápio) entram num
+            # índice temporário; como já estão na dieta, nunca são candidatos a acréscimo
+            externos = [alimento for alimento, i in zip(selecionados, indices) if i is None]
+            temporario = CatalogoAlimentos(self.catalogo.alimentos + externos)
+            return IndiceCalorico(temporario).reparar_alimentos(selecionados, meta_calorica)
+        alimentos = self.catalogo.alimentos
+        return [alimentos[i] for i in self.reparar(indices, meta_calorica)]
+
+    def reparar_populacao(self, populacao: np.ndarray, meta_calorica: float) -> np.ndarray:
+        """Reparo lamarckiano: corrige no próprio array as linhas fora da janela
+
+        Returns:
+            Linhas dos indivíduos alterados
+        """
+        calorias_total = populacao @ self.catalogo.calorias
+        fora = np.flatnonzero((calorias_total < meta_calorica * 0.90) | (calorias_total > meta_calorica * 1.10))
+        alterados = []
+        for linha in fora:
+            indices = np.flatnonzero(populacao[linha]).tolist()
+            reparados = self.reparar(indices, meta_calorica)
+            if len(reparados) != len(indices):
+                populacao[linha] = 0
+                populacao[linha, reparados] = 1
+                alterados.append(linha)
+        return np.array(alterados, dtype=np.intp)
+
+_indices = CachePorCatalogo(IndiceCalorico)
+
+def obter_indice_calorico(catalogo: CatalogoAlimentos) -> IndiceCalorico:
+    return _indices.obter(catalogo)
@@ -0,0 +1,128 @@
+from typing import List, Sequence
+from bisect import bisect_right
+import numpy as np
+from src.utils.catalogo_utils import CatalogoAlimentos, CATEGORIAS, ID_OUTRO
+from src.utils.reparo_utils import IndiceCalorico, obter_indice_calorico
+
+# Categorias com bônus de presença no fitness e limites da faixa que o fitness premia
+CATEGORIAS_OBRIGATORIAS = ('proteinas', 'carboidratos', 'vegetais', 'frutas')
+MINIMO_ALIMENTOS = 5
+MAXIMO_ALIMENTOS = 7
+MAXIMO_POR_CATEGORIA = 2
+
+class _Construtor:
+    """Dieta em construção: nunca passa de 110% da meta, de 7 alimentos nem de 2 por categoria"""
+    def __init__(self, catalogo: CatalogoAlimentos, indice: IndiceCalorico, meta_calorica: float):
+        self.indice = indice
+        self.categorias = catalogo.categorias.tolist()
+        self.meta_calorica = meta_calorica
+        self.inferior, self.superior = meta_calorica * 0.90, meta_calorica * 1.10
+        self.selecionados: List[int] = []
+        self.membros = 0
+        self.total = 0.0
+        self.por_categoria = [0] * (ID_OUTRO + 1)
+
+    def cabe(self, i: int) -> bool:
+        categoria = self.categorias[i]
+        return (not self.membros >> i & 1 and len(self.selecionados) < MAXIMO_ALIMENTOS
+                and self.total + self.indice.calorias[i] <= self.superior
+                and (categoria == ID_OUTRO or self.por_categoria[categoria] < MAXIMO_POR_CATEGORIA))
+
+    def adicionar(self, i: int):
+        self.selecionados.append(i)
+        self.membros |= 1 << i
+        self.total += self.indice.calorias[i]
+        self.por_categoria[self.categorias[i]] += 1
+
+    def remover(self, i: int):
+        self.selecionados.remove(i)
+        self.membros &= ~(1 << i)
+        self.total -= self.indice.calorias[i]
+        self.por_categoria[self.categorias[i]] -= 1
+
+    def preencher(self, preferencia: Sequence[int], ate: int):
+        for i in preferencia:
+            if len(self.selecionados) >= ate:
+                break
+            if self.cabe(i):
+                self.adicionar(i)
+
+    def completar(self):
+        """Até entrar na janela, divide as calorias que faltam entre as vagas livres e
+        acrescenta o alimento de calorias mais próximas dessa parcela (busca binária)"""
+        ordem, calorias_ordenadas = self.indice.ordem, self.indice.calorias_ordenadas
+        while self.total < self.inferior and len(self.selecionados) < MAXIMO_ALIMENTOS:
+            parcela = (self.meta_calorica - self.total) / (MAXIMO_ALIMENTOS - len(self.selecionados))
+            direita = bisect_right(calorias_ordenadas, parcela)
+            esquerda = direita - 1
+            escolhido = None
+            # Expande a partir da parcela até achar o vizinho mais próximo que cabe
+            while escolhido is None and (esquerda >= 0 or direita < len(ordem)):
+                if direita >= len(ordem) or (esquerda >= 0 and parcela - calorias_ordenadas[esquerda]
+                                             <= calorias_ordenadas[direita] - parcela):
+                    candidato, esquerda = ordem[esquerda], esquerda - 1
+                else:
+                    candidato, direita = ordem[direita], direita + 1
+                if self.cabe(candidato):
+                    escolhido = candidato
+            if escolhido is None:
+                break
+            self.adicionar(escolhido)
+
+def _construir(catalogo: CatalogoAlimentos, indice: IndiceCalorico, meta_calorica: float,
+               preferencia: Sequence[int], alvo: int, obrigatorios: Sequence[int] = ()) -> List[int]:
+    """Obrigatórios, depois a preferência até alvo-1 alimentos, completa a janela calórica
+    e garante o mínimo de 5 alimentos"""
+    construtor = _Construtor(catalogo, indice, meta_calorica)
+    construtor.preencher(obrigatorios, MAXIMO_ALIMENTOS)
+    construtor.preencher(preferencia, alvo - 1)
+    construtor.completar()
+
+    # Sem vagas e ainda abaixo da janela: troca o alimento mais leve por um mais calórico
+    calorias = indice.calorias
+    for _ in range(MAXIMO_ALIMENTOS):
+        removiveis = [i for i in construtor.selecionados if i not in obrigatorios]
+        if construtor.total >= construtor.inferior or not removiveis:
+            break
+        total_anterior = construtor.total
+        construtor.remover(min(removiveis, key=lambda i: calorias[i]))
+        construtor.completar()
+        if construtor.total <= total_anterior:
+            break
+
+    construtor.preencher(preferencia, MINIMO_ALIMENTOS)
+    return construtor.selecionados
+
+def semear_populacao(catalogo: CatalogoAlimentos, meta_calorica: float, quantidade: int,
+                     gerador: np.random.Generator) -> np.ndarray:
+    """Indivíduos construtivos para a população inicial (quantidade × alimentos)
+
+    O primeiro é guloso pela razão pontuação/caloria; o segundo parte do melhor
+    alimento (pela razão) de cada categoria com bônus de presença; os demais são
+    variantes aleatórias (preferência pela razão com ruído, categorias sorteadas
+    em metade deles e 5-7 alimentos). Todos respeitam o teto de 110% da meta e
+    são completados até a janela de ±10% quando possível.
+    """
+    indice = obter_indice_calorico(catalogo)
+    num_alimentos = len(catalogo)
+    razao = catalogo.pontuacoes(meta_calorica) / np.maximum(catalogo.calorias, 1.0)
+    preferencia_gulosa = np.argsort(-razao, kind='stable').tolist()
+    membros_categoria = [np.flatnonzero(catalogo.categorias == CATEGORIAS.index(categoria))
+                         for categoria in CATEGORIAS_OBRIGATORIAS]
+    melhores_categoria = [int(membros[np.argmax(razao[membros])]) for membros in membros_categoria if len(membros)]
+
+    populacao = np.zeros((quantidade, num_alimentos), dtype=np.uint8)
+    for linha in range(quantidade):
+        if linha == 0:
+            indices = _construir(catalogo, indice, meta_calorica, preferencia_gulosa, 6)
+        elif linha == 1:
+            indices = _construir(catalogo, indice, meta_calorica, preferencia_gulosa, 6, melhores_categoria)
+        else:
+            preferencia = np.argsort(-(razao * gerador.random(num_alimentos)), kind='stable').tolist()
+            obrigatorios = []
+            if gerador.random() < 0.5:
+                obrigatorios = [int(gerador.choice(membros)) for membros in membros_categoria if len(membros)]
+            indices = _construir(catalogo, indice, meta_calorica, preferencia,
+                                 int(gerador.integers(MINIMO_ALIMENTOS, MAXIMO_ALIMENTOS + 1)), obrigatorios)
+        populacao[linha, indices] = 1
+    return populacao
@@ -0,0 +1,111 @@
+from typing import Dict, Optional
+import time
+import numpy as np
+from src.utils.cromossomo_utils import CacheFitness
+from src.utils.alg_utils import diversidade_populacao
+
+# Colunas de cada registro do buffer (uma linha por geração)
+CAMPOS = ('execucao', 'geracao', 'melhor', 'media', 'pior', 'diversidade', 'avaliacoes', 'acertos_cache',
+          'tempo_ms')
+
+class TelemetriaAG:
+    """Telemetria opcional do algoritmo genético, por geração
+
+    Cada geração grava uma linha (fitness melhor/médio/pior, diversidade,
+    avaliações de fitness, acertos do cache e tempo desde o início da execução)
+    num buffer circular pré-alocado; quando ele enche, as linhas mais antigas
+    são sobrescritas. Os totais usados em resumo() são acumulados à parte e não
+    se perdem com a sobrescrita.
+
+    Uso: SessaoOtimizador(telemetria=TelemetriaAG()); cada simular_evolucao
+    reinicia a telemetria da sessão, então resumo() descreve a última simulação.
+    """
+    def __init__(self, capacidade: int = 4096):
+        self.capacidade = capacidade
+        self._dados = np.zeros((capacidade, len(CAMPOS)), dtype=np.float64)
+        self.limpar()
+
+    def limpar(self):
+        self._total = 0  # Linhas já gravadas; a próxima vai para _total % capacidade
+        self.execucoes = 0
+        self.geracoes = 0
+        self.avaliacoes = 0
+        self.acertos_cache = 0
+        self.tempo_s = 0.0
+        self._soma_convergencia = 0
+        self._execucao_aberta = False
+
+    def iniciar_execucao(self, cache: Optional[CacheFitness] = None):
+        """Abre uma execução do AG; com o cache, avaliações e acertos são medidos por diferença"""
+        self.execucoes += 1
+        self._execucao_aberta = True
+        self._inicio = time.perf_counter()
+        self._cache = cache
+        self._marca_cache = self._contadores_cache()
+        self._melhor = -float('inf')
+        self._geracao_convergencia = 0
+        self._ultima_geracao = 0
+
+    def _contadores_cache(self):
+        if self._cache is None:
+            return 0, 0
+        # Cada genótipo avaliado é guardado uma vez: tamanho + remoções conta as avaliações
+        return len(self._cache) + self._cache.remocoes, self._cache.acertos
+
+    def registrar(self, geracao: int, populacao: np.ndarray, aptidao: np.ndarray,
+                  avaliacoes: Optional[int] = None, acertos_cache: Optional[int] = None,
+                  diversidade: Optional[float] = None):
+        """Grava a geração (0 = população inicial)
+
+        Sem avaliacoes/acertos_cache explícitos, usa a variação do cache da execução.
+        Sem diversidade, ela é calculada da população (matriz 0/1).
+        """
+        if avaliacoes is None or acertos_cache is None:
+            marca = self._contadores_cache()
+            avaliacoes = marca[0] - self._marca_cache[0]
+            acertos_cache = marca[1] - self._marca_cache[1]
+            self._marca_cache = marca
+
+        melhor = float(aptidao.max())
+        self._dados[self._total % self.capacidade] = (
+            self.execucoes, geracao, melhor, float(aptidao.mean()), float(aptidao.min()),
+            diversidade if diversidade is not None else diversidade_populacao(populacao), avaliacoes, acertos_cache,
+            (time.perf_counter() - self._inicio) * 1000)
+        self._total += 1
+
+        self.avaliacoes += avaliacoes
+        self.acertos_cache += acertos_cache
+        if melhor > self._melhor:
+            self._melhor = melhor
+            self._geracao_convergencia = geracao
+        self._ultima_geracao = geracao
+
+    def finalizar_execucao(self):
+        if not self._execucao_aberta:
+            return
+        self._execucao_aberta = False
+        self.tempo_s += time.perf_counter() - self._inicio
+        self.geracoes += self._ultima_geracao
+        self._soma_convergencia += self._geracao_convergencia
+
+    def registros(self) -> Dict[str, np.ndarray]:
+        """Linhas ainda no buffer, da mais antiga para a mais recente, por campo"""
+        quantidade = min(self._total, self.capacidade)
+        inicio = self._total - quantidade
+        linhas = self._dados[np.arange(inicio, self._total) % self.capacidade]
+        return {campo: linhas[:, i] for i, campo in enumerate(CAMPOS)}
+
+    def resumo(self) -> dict:
+        """Totais desde o último limpar(): vazão e gerações até convergir (média por execução)"""
+        finalizadas = self.execucoes - self._execucao_aberta
+        consultas = self.avaliacoes + self.acertos_cache
+        return {
+            'execucoes': self.execucoes,
+            'geracoes': self.geracoes,
+            'avaliacoes': self.avaliacoes,
+            'acertos_cache': self.acertos_cache,
+            'taxa_acerto_cache': self.acertos_cache / consultas if consultas else 0.0,
+            'tempo_s': self.tempo_s,
+            'avaliacoes_por_segundo': self.avaliacoes / self.tempo_s if self.tempo_s else 0.0,
+            'geracoes_ate_convergir': self._soma_convergencia / finalizadas if finalizadas else 0.0,
+        }